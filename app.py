@@ -5,7 +5,6 @@ Version: 1.0.0
 """
 
 import os
-from flask import Flask
 from app import create_app, db
 from app.models import *  # Import all models for migrations
 
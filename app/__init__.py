@@ -17,10 +17,21 @@ def create_app(config_name='default'):
     """Application factory pattern"""
     app = Flask(__name__)
     
+    # Serialize API responses with orjson
+    from app.utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+    
     # Load configuration
     from app.config import config
     app.config.from_object(config[config_name])
     
+    # Outside debug, templates are compiled once per process and not
+    # re-checked on disk; the bytecode cache also spares each new worker
+    # the parse and compile step
+    if not app.debug:
+        from jinja2 import FileSystemBytecodeCache
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+    
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
@@ -28,7 +39,27 @@ def create_app(config_name='default'):
     cors.init_app(app)
     ma.init_app(app)
     
+    # Reject revoked tokens (no-op without REDIS_URL)
+    from app.utils.token_blocklist import is_token_revoked
+    jwt.token_in_blocklist_loader(is_token_revoked)
+    
+    # Defer activity log writes to the worker when ACTIVITY_LOG_ASYNC is set
+    from app.utils.activity_queue import register_activity_queue, activity_worker_command
+    register_activity_queue()
+    app.cli.add_command(activity_worker_command)
+    
+    # Drop Redis-cached project roles once membership changes commit
+    from app.utils.permissions import register_role_cache
+    register_role_cache()
+    
     # Import models to ensure they're registered with SQLAlchemy
     from app import models
     
+    # Register blueprints once, here, so every entry point shares one setup
+    from app.api import create_api_blueprint
+    from app.views import view_blueprints
+    app.register_blueprint(create_api_blueprint())
+    for blueprint in view_blueprints:
+        app.register_blueprint(blueprint)
+    
     return app
\ No newline at end of file
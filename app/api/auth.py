@@ -2,17 +2,88 @@
 Authentication API endpoints
 """
 
-from flask import Blueprint, request
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+import hashlib
+import hmac
+from threading import Lock
+from cachetools import TTLCache
+from flask import Blueprint, request, current_app
+from sqlalchemy.exc import IntegrityError
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime
 from app import db
 from app.models import User
-from app.schemas import UserCreateSchema, UserLoginSchema, UserSchema
+from app.schemas import UserCreateSchema, UserLoginSchema
 from app.utils.responses import success_response, error_response, validation_error_response
 from app.utils.helpers import validate_json
+from app.utils.token_blocklist import revoke_token
+from app.utils.user_cache import dump_user, get_cached_user
 
 auth_bp = Blueprint('auth', __name__)
 
+# Users whose last_login was written within LAST_LOGIN_UPDATE_INTERVAL;
+# created on first use because the interval comes from the app config
+_last_login_writes = None
+_last_login_lock = Lock()
+
+def _should_update_last_login(user_id) -> bool:
+    """
+    Throttle last_login writes so repeated logins don't UPDATE the row every time
+    
+    Args:
+        user_id: User ID
+        
+    Returns:
+        True if last_login should be written for this login
+    """
+    global _last_login_writes
+    with _last_login_lock:
+        if _last_login_writes is None:
+            interval = current_app.config.get('LAST_LOGIN_UPDATE_INTERVAL', 60)
+            _last_login_writes = TTLCache(maxsize=10_000, ttl=interval)
+        if user_id in _last_login_writes:
+            return False
+        _last_login_writes[user_id] = True
+    return True
+
+# Keys of recently verified (user, password hash, password) combinations
+_verified_passwords = TTLCache(maxsize=10_000, ttl=30)
+_verified_passwords_lock = Lock()
+
+def _check_password(user, password) -> bool:
+    """
+    Verify a password, reusing recent successful checks when enabled
+    
+    Opt-in via PASSWORD_CHECK_CACHE_ENABLED. The cache key is an HMAC over the
+    user ID, the stored hash and the password, so a password change (new hash)
+    never matches an old entry and plaintext passwords are never kept.
+    
+    Args:
+        user: User attempting to log in
+        password: Plaintext password
+        
+    Returns:
+        True if the password is correct
+    """
+    if not current_app.config.get('PASSWORD_CHECK_CACHE_ENABLED', False):
+        return user.check_password(password)
+    
+    key = hmac.new(
+        current_app.config['SECRET_KEY'].encode(),
+        f"{user.id}:{user.password_hash}:{password}".encode(),
+        hashlib.sha256
+    ).digest()
+    
+    with _verified_passwords_lock:
+        if key in _verified_passwords:
+            return True
+    
+    if not user.check_password(password):
+        return False
+    
+    with _verified_passwords_lock:
+        _verified_passwords[key] = True
+    return True
+
 @auth_bp.route('/register', methods=['POST'])
 @validate_json(UserCreateSchema)
 def register(validated_data):
@@ -44,8 +115,7 @@ def register(validated_data):
         refresh_token = create_refresh_token(identity=str(user.id))
         
         # Serialize user data
-        user_schema = UserSchema()
-        user_data = user_schema.dump(user)
+        user_data = dump_user(user)
         
         response_data = {
             'user': user_data,
@@ -59,6 +129,11 @@ def register(validated_data):
             status_code=201
         )
         
+    except IntegrityError:
+        # Unique index on username or email; one message for both avoids
+        # revealing which accounts exist
+        db.session.rollback()
+        return error_response("Username or email already in use", status_code=409)
     except Exception as e:
         db.session.rollback()
         return error_response(f"Registration failed: {str(e)}", status_code=500)
@@ -80,28 +155,33 @@ def login(validated_data):
     password = validated_data['password']
     remember_me = validated_data.get('remember_me', False)
     
-    # Find user by username or email
-    user = User.query.filter(
-        (User.username == username_or_email) | 
-        (User.email == username_or_email)
-    ).first()
+    # Find user by email or username; usernames cannot contain '@', so one
+    # indexed column is enough
+    lookup_field = User.email if '@' in username_or_email else User.username
+    user = User.query.filter(lookup_field == username_or_email).first()
+    
+    # Unknown users still pay for one password hash so response time does
+    # not reveal which usernames exist
+    if not user:
+        User.verify_dummy_password(password)
+        return error_response("Invalid credentials", status_code=401)
     
-    if not user or not user.check_password(password):
+    if not _check_password(user, password):
         return error_response("Invalid credentials", status_code=401)
     
     if not user.is_active:
         return error_response("Account is deactivated", status_code=401)
     
-    # Update last login
-    user.update_last_login()
+    # Update last login (coalesced for rapid re-logins)
+    if _should_update_last_login(user.id):
+        user.update_last_login()
     
     # Generate tokens
     access_token = create_access_token(identity=str(user.id))
     refresh_token = create_refresh_token(identity=str(user.id))
     
     # Serialize user data
-    user_schema = UserSchema()
-    user_data = user_schema.dump(user)
+    user_data = dump_user(user)
     
     response_data = {
         'user': user_data,
@@ -124,7 +204,7 @@ def refresh():
     Headers: Authorization: Bearer <refresh_token>
     """
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = get_cached_user(current_user_id)
     
     if not user or not user.is_active:
         return error_response("Invalid user", status_code=401)
@@ -147,13 +227,12 @@ def get_current_user():
     Headers: Authorization: Bearer <access_token>
     """
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = get_cached_user(current_user_id)
     
     if not user:
         return error_response("User not found", status_code=404)
     
-    user_schema = UserSchema()
-    user_data = user_schema.dump(user)
+    user_data = dump_user(user)
     
     return success_response(
         data=user_data,
@@ -169,9 +248,9 @@ def logout():
     POST /api/auth/logout
     Headers: Authorization: Bearer <access_token>
     
-    Note: In a production environment, you would want to blacklist the token
+    Revokes the access token when Redis is configured
     """
-    # TODO: Implement token blacklisting with Redis
+    revoke_token(get_jwt())
     return success_response(message="Logout successful")
 
 @auth_bp.route('/forgot-password', methods=['POST'])
@@ -3,16 +3,24 @@ Comments API endpoints
 """
 
 from flask import Blueprint
+from sqlalchemy.orm import joinedload
 from app import db
-from app.models import Comment, Task, Project, ProjectMember, ActivityLog, ActivityAction
+from app.models import Comment, Task, MemberRole, ActivityLog, ActivityAction
 from app.schemas import CommentSchema, CommentCreateSchema, CommentUpdateSchema
 from app.utils.responses import success_response, error_response
-from app.utils.decorators import jwt_required_with_user
-from app.utils.helpers import validate_json, get_or_404, paginate_query
+from app.utils.cache import invalidate_cache
+from app.utils.decorators import jwt_required_with_user, conditional_get
+from app.utils.permissions import OWNER_ROLE, get_project_role, load_task_with_access
+from app.utils.helpers import validate_json, get_or_404, paginate_query, strict_load_options
+from app.utils.transactions import transaction
 
 comments_bp = Blueprint('comments', __name__)
 
+comment_schema = CommentSchema()
+comments_schema = CommentSchema(many=True)
+
 @comments_bp.route('/tasks/<task_id>/comments', methods=['GET'])
+@conditional_get
 @jwt_required_with_user
 def get_task_comments(current_user, task_id):
     """
@@ -20,25 +28,18 @@ def get_task_comments(current_user, task_id):
     
     GET /api/comments/tasks/{task_id}/comments?page=1&per_page=20
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     
     # Check project access
-    project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member:
-            return error_response("Access denied", status_code=403)
+    if role is None:
+        return error_response("Access denied", status_code=403)
     
     # Get comments with pagination
     query = Comment.query.filter_by(task_id=task_id).order_by(Comment.created_at.asc())
-    pagination_data = paginate_query(query)
+    pagination_data = paginate_query(query, load_options=strict_load_options(joinedload(Comment.user)))
     
     # Serialize comments
-    comment_schema = CommentSchema(many=True)
-    comments_data = comment_schema.dump(pagination_data['items'])
+    comments_data = comments_schema.dump(pagination_data['items'])
     
     return success_response(
         data={
@@ -65,17 +66,12 @@ def create_comment(current_user, task_id, validated_data):
         "content": "This is a comment"
     }
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     
     # Check project access
+    if role is None:
+        return error_response("Access denied", status_code=403)
     project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member:
-            return error_response("Access denied", status_code=403)
     
     try:
         comment = Comment(
@@ -97,8 +93,8 @@ def create_comment(current_user, task_id, validated_data):
         )
         
         db.session.commit()
+        invalidate_cache(f'task:{task_id}')
         
-        comment_schema = CommentSchema()
         comment_data = comment_schema.dump(comment)
         
         return success_response(
@@ -130,12 +126,12 @@ def update_comment(current_user, comment_id, validated_data):
         return error_response("You can only edit your own comments", status_code=403)
     
     try:
-        comment.content = validated_data['content']
-        comment.mark_edited()
+        with transaction():
+            comment.content = validated_data['content']
+            comment.mark_edited()
         
-        db.session.commit()
+        invalidate_cache(f'task:{comment.task_id}')
         
-        comment_schema = CommentSchema()
         comment_data = comment_schema.dump(comment)
         
         return success_response(
@@ -155,7 +151,11 @@ def delete_comment(current_user, comment_id):
     
     DELETE /api/comments/{comment_id}
     """
-    comment = get_or_404(Comment, comment_id)
+    # Task and project come back in the same statement for the admin check below
+    comment = get_or_404(
+        Comment, comment_id,
+        load_options=[joinedload(Comment.task).joinedload(Task.project)]
+    )
     
     # Check if user can delete (author or project admin/owner)
     can_delete = False
@@ -164,25 +164,17 @@ def delete_comment(current_user, comment_id):
         can_delete = True
     else:
         # Check if user is project admin/owner
-        task = comment.task
-        project = task.project
-        
-        if project.owner_id == current_user.id:
-            can_delete = True
-        else:
-            member = ProjectMember.query.filter_by(
-                project_id=project.id,
-                user_id=current_user.id
-            ).first()
-            if member and member.role.value == 'admin':
-                can_delete = True
+        role = get_project_role(current_user.id, comment.task.project_id)
+        can_delete = role == OWNER_ROLE or role is MemberRole.ADMIN
     
     if not can_delete:
         return error_response("Insufficient permissions to delete comment", status_code=403)
     
     try:
+        task_id = comment.task_id
         db.session.delete(comment)
         db.session.commit()
+        invalidate_cache(f'task:{task_id}')
         
         return success_response(message="Comment deleted successfully")
         
@@ -3,37 +3,99 @@ Project management API endpoints
 """
 
 from flask import Blueprint, request
+from psycopg2 import errorcodes
+from sqlalchemy import String, and_, cast, exists, func, insert, literal, or_, select
+from sqlalchemy.exc import IntegrityError
 from app import db
-from app.models import Project, ProjectMember, User, MemberRole
+from app.models import Project, ProjectMember, Task, User, MemberRole
 from app.schemas import ProjectSchema, ProjectCreateSchema, ProjectUpdateSchema, ProjectMemberSchema, ProjectMemberUpdateSchema
 from app.utils.responses import success_response, error_response
-from app.utils.decorators import jwt_required_with_user, permission_required
+from app.utils.cache import cached, invalidate_cache
+from app.utils.redis_client import get_redis
+from app.utils.decorators import jwt_required_with_user, permission_required, conditional_get
 from app.utils.helpers import validate_json, get_or_404, paginate_query
+from app.utils.permissions import mark_project_roles_stale
 
 projects_bp = Blueprint('projects', __name__)
 
+project_schema = ProjectSchema()
+
+# Columns for list_projects, selected directly rather than loading Project
+# instances and dumping them through ProjectSchema
+_PROJECT_LIST_FIELDS = ('id', 'name', 'description', 'color', 'icon', 'owner_id',
+                        'is_archived', 'created_at', 'updated_at')
+_OWNER_FIELDS = ('id', 'username', 'full_name')
+
+def _project_list_row_to_dict(row) -> dict:
+    """
+    Build a project list item shaped like ProjectSchema's output
+    
+    Args:
+        row: Row of _PROJECT_LIST_FIELDS, _OWNER_FIELDS, tasks_count, members_count
+        
+    Returns:
+        Serialized project
+    """
+    n = len(_PROJECT_LIST_FIELDS)
+    project = dict(zip(_PROJECT_LIST_FIELDS, row[:n]))
+    project['id'] = str(project['id'])
+    project['owner_id'] = str(project['owner_id'])
+    project['created_at'] = project['created_at'].isoformat()
+    project['updated_at'] = project['updated_at'].isoformat()
+    
+    owner = dict(zip(_OWNER_FIELDS, row[n:n + len(_OWNER_FIELDS)]))
+    owner['id'] = str(owner['id'])
+    project['owner'] = owner
+    
+    project['tasks_count'], project['members_count'] = row[-2:]
+    return project
+
+def _invalidate_project_caches(project_id) -> None:
+    """Drop cached responses that depend on a project's settings or membership"""
+    if get_redis() is None:
+        return
+    task_ids = db.session.scalars(select(Task.id).where(Task.project_id == project_id))
+    invalidate_cache('projects', 'tags', *(f'task:{task_id}' for task_id in task_ids))
+
 @projects_bp.route('', methods=['GET'])
+@conditional_get
 @jwt_required_with_user
+@cached('projects', ttl=60)
 def list_projects(current_user):
     """
     List all user's projects
     
     GET /api/projects?page=1&per_page=20&archived=false
     """
-    # Build query for user's projects (owned + member)
-    owned_projects = Project.query.filter_by(owner_id=current_user.id)
-    
-    member_project_ids = db.session.query(ProjectMember.project_id).filter_by(
-        user_id=current_user.id
-    ).subquery()
-    
-    member_projects = Project.query.filter(
-        Project.id.in_(member_project_ids)
+    # Build query for user's projects (owned + member) in a single pass;
+    # the outer join matches at most one membership row per project
+    tasks_count = select(func.count()).select_from(Task).where(
+        Task.project_id == Project.id
+    ).correlate(Project).scalar_subquery()
+    members_count = select(func.count()).select_from(ProjectMember).where(
+        ProjectMember.project_id == Project.id
+    ).correlate(Project).scalar_subquery()
+    
+    query = db.session.query(
+        *(getattr(Project, field) for field in _PROJECT_LIST_FIELDS),
+        *(getattr(User, field) for field in _OWNER_FIELDS),
+        tasks_count.label('tasks_count'),
+        members_count.label('members_count')
+    ).join(
+        User, User.id == Project.owner_id
+    ).outerjoin(
+        ProjectMember,
+        and_(
+            ProjectMember.project_id == Project.id,
+            ProjectMember.user_id == current_user.id
+        )
+    ).filter(
+        or_(
+            Project.owner_id == current_user.id,
+            ProjectMember.user_id == current_user.id
+        )
     )
     
-    # Combine queries
-    query = owned_projects.union(member_projects)
-    
     # Apply filters
     archived = request.args.get('archived', 'false').lower() == 'true'
     query = query.filter(Project.is_archived == archived)
@@ -45,8 +107,7 @@ def list_projects(current_user):
     pagination_data = paginate_query(query)
     
     # Serialize projects
-    project_schema = ProjectSchema(many=True)
-    projects_data = project_schema.dump(pagination_data['items'])
+    projects_data = [_project_list_row_to_dict(row) for row in pagination_data['items']]
     
     return success_response(
         data={
@@ -87,8 +148,8 @@ def create_project(current_user, validated_data):
         
         db.session.add(project)
         db.session.commit()
+        invalidate_cache('projects')
         
-        project_schema = ProjectSchema()
         project_data = project_schema.dump(project)
         
         return success_response(
@@ -110,7 +171,6 @@ def get_project(current_user, project, project_id):
     
     GET /api/projects/{project_id}
     """
-    project_schema = ProjectSchema()
     project_data = project_schema.dump(project)
     
     return success_response(
@@ -140,8 +200,8 @@ def update_project(current_user, project, project_id, validated_data):
                 setattr(project, field, value)
         
         db.session.commit()
+        _invalidate_project_caches(project.id)
         
-        project_schema = ProjectSchema()
         project_data = project_schema.dump(project)
         
         return success_response(
@@ -171,6 +231,7 @@ def delete_project(current_user, project_id):
         # Soft delete by archiving
         project.is_archived = True
         db.session.commit()
+        _invalidate_project_caches(project.id)
         
         return success_response(message="Project deleted successfully")
         
@@ -190,6 +251,7 @@ def toggle_archive_project(current_user, project, project_id):
     try:
         project.is_archived = not project.is_archived
         db.session.commit()
+        _invalidate_project_caches(project.id)
         
         action = "archived" if project.is_archived else "unarchived"
         return success_response(message=f"Project {action} successfully")
@@ -199,6 +261,7 @@ def toggle_archive_project(current_user, project, project_id):
         return error_response(f"Archive operation failed: {str(e)}", status_code=500)
 
 @projects_bp.route('/<project_id>/members', methods=['GET'])
+@conditional_get
 @jwt_required_with_user
 @permission_required('viewer')
 def get_project_members(current_user, project, project_id):
@@ -207,31 +270,43 @@ def get_project_members(current_user, project, project_id):
     
     GET /api/projects/{project_id}/members
     """
-    members_query = db.session.query(ProjectMember, User).join(
-        User, ProjectMember.user_id == User.id
-    ).filter(ProjectMember.project_id == project_id)
+    # Owner row and member rows in one statement; roles are cast to text so
+    # both arms of the UNION ALL share a column type
+    owner_query = db.session.query(
+        User.id,
+        User.username,
+        User.full_name,
+        User.avatar_url,
+        literal('owner').label('role'),
+        Project.created_at.label('joined_at')
+    ).join(Project, Project.owner_id == User.id).filter(Project.id == project_id)
+    
+    members_query = db.session.query(
+        User.id,
+        User.username,
+        User.full_name,
+        User.avatar_url,
+        cast(ProjectMember.role, String).label('role'),
+        ProjectMember.joined_at.label('joined_at')
+    ).join(ProjectMember, ProjectMember.user_id == User.id).filter(
+        ProjectMember.project_id == project_id
+    )
     
     members_data = []
-    for member, user in members_query.all():
-        members_data.append({
-            'user_id': str(user.id),
-            'username': user.username,
-            'full_name': user.full_name,
-            'avatar_url': user.avatar_url,
-            'role': member.role.value,
-            'joined_at': member.joined_at.isoformat()
-        })
-    
-    # Add project owner
-    owner_data = {
-        'user_id': str(project.owner.id),
-        'username': project.owner.username,
-        'full_name': project.owner.full_name,
-        'avatar_url': project.owner.avatar_url,
-        'role': 'owner',
-        'joined_at': project.created_at.isoformat()
-    }
-    members_data.insert(0, owner_data)
+    for user_id, username, full_name, avatar_url, role, joined_at in owner_query.union_all(members_query).all():
+        member_data = {
+            'user_id': str(user_id),
+            'username': username,
+            'full_name': full_name,
+            'avatar_url': avatar_url,
+            'role': role if role == 'owner' else MemberRole[role].value,
+            'joined_at': joined_at.isoformat()
+        }
+        # Project owner is always listed first
+        if role == 'owner':
+            members_data.insert(0, member_data)
+        else:
+            members_data.append(member_data)
     
     return success_response(
         data={'members': members_data},
@@ -255,37 +330,47 @@ def add_project_member(current_user, project, project_id, validated_data):
     user_id = validated_data['user_id']
     role = validated_data.get('role', 'member')
     
-    # Check if user exists
-    user = get_or_404(User, user_id)
-    
-    # Check if already a member
-    existing_member = ProjectMember.query.filter_by(
-        project_id=project_id,
-        user_id=user_id
-    ).first()
-    
-    if existing_member:
-        return error_response("User is already a project member", status_code=400)
-    
     # Cannot add owner as member
     if str(project.owner_id) == str(user_id):
         return error_response("Project owner cannot be added as member", status_code=400)
     
     try:
-        member = ProjectMember(
-            project_id=project_id,
-            user_id=user_id,
-            role=MemberRole(role)
+        # Insert only when no membership row exists yet; an unknown user
+        # surfaces as a foreign key violation rather than a separate lookup
+        already_member = exists().where(and_(
+            ProjectMember.project_id == project.id,
+            ProjectMember.user_id == user_id
+        ))
+        stmt = insert(ProjectMember).from_select(
+            ['project_id', 'user_id', 'role'],
+            select(
+                literal(project.id, ProjectMember.project_id.type),
+                literal(user_id, ProjectMember.user_id.type),
+                cast(literal(MemberRole(role), ProjectMember.role.type), ProjectMember.role.type)
+            ).where(~already_member)
         )
         
-        db.session.add(member)
+        result = db.session.execute(stmt)
+        if result.rowcount == 0:
+            db.session.rollback()
+            return error_response("User is already a project member", status_code=400)
+        
+        # The Core insert skips the mapper events that invalidate roles
+        mark_project_roles_stale(project.id)
         db.session.commit()
+        _invalidate_project_caches(project.id)
         
         return success_response(
             message=f"User added to project as {role}",
             status_code=201
         )
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if getattr(e.orig, 'pgcode', None) == errorcodes.FOREIGN_KEY_VIOLATION:
+            return error_response("User not found", status_code=404)
+        # Lost a race with a concurrent insert of the same membership
+        return error_response("User is already a project member", status_code=400)
     except Exception as e:
         db.session.rollback()
         return error_response(f"Failed to add member: {str(e)}", status_code=500)
@@ -316,6 +401,7 @@ def update_member_role(current_user, project, project_id, user_id, validated_dat
     try:
         member.role = MemberRole(new_role)
         db.session.commit()
+        _invalidate_project_caches(project.id)
         
         return success_response(message=f"Member role updated to {new_role}")
         
@@ -347,6 +433,7 @@ def remove_project_member(current_user, project, project_id, user_id):
     try:
         db.session.delete(member)
         db.session.commit()
+        _invalidate_project_caches(project.id)
         
         return success_response(message="Member removed from project")
         
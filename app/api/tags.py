@@ -2,40 +2,64 @@
 Tags API endpoints
 """
 
+import uuid
 from flask import Blueprint, request
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from app import db
-from app.models import Tag, Project, ProjectMember, Task, TaskTag
+from app.models import Tag, Project, ProjectMember, MemberRole, TaskTag
 from app.schemas import TagSchema, TagCreateSchema, TagUpdateSchema
-from app.utils.responses import success_response, error_response
-from app.utils.decorators import jwt_required_with_user, permission_required
-from app.utils.helpers import validate_json, get_or_404, paginate_query
+from app.utils.responses import success_response, error_response, no_content_response
+from app.utils.cache import cached, invalidate_cache
+from app.utils.decorators import jwt_required_with_user, permission_required, conditional_get
+from app.utils.permissions import get_project_role, load_task_with_access
+from app.utils.helpers import validate_json, get_or_404, paginate_query_countless, paginate_keyset, encode_cursor
 
 tags_bp = Blueprint('tags', __name__)
 
+tag_schema = TagSchema()
+tags_schema = TagSchema(many=True)
+
+# Unique sort key for tag listings, used for keyset pagination cursors
+TAG_SORT_KEY = (Tag.name, Tag.id)
+
+# Columns update_tag may set
+TAG_UPDATE_FIELDS = frozenset({'name', 'color'})
+
+def _can_list_tags(current_user, **kwargs) -> bool:
+    """
+    Access check run before cached tag listings are served
+    
+    Listings without a project_id only cover the user's own projects, and
+    membership changes drop the 'tags' namespace.
+    """
+    project_id = request.args.get('project_id')
+    return not project_id or get_project_role(current_user.id, project_id) is not None
+
 @tags_bp.route('', methods=['GET'])
+@conditional_get
 @jwt_required_with_user
+@cached('tags', access=_can_list_tags)
 def list_tags(current_user):
     """
     List all tags accessible to user
     
     GET /api/tags?project_id=xxx&page=1&per_page=20
+    GET /api/tags?cursor=<next_cursor>&per_page=20  (keyset pagination)
     """
-    # Base query for user's accessible tags
-    query = Tag.query
+    # Base query for user's accessible tags; projects are batch-loaded for serialization
+    query = Tag.query.options(selectinload(Tag.project))
     
     # Filter by project if specified
     project_id = request.args.get('project_id')
     if project_id:
-        project = get_or_404(Project, project_id)
+        get_or_404(Project, project_id)
         
         # Check project access
-        if project.owner_id != current_user.id:
-            member = ProjectMember.query.filter_by(
-                project_id=project_id,
-                user_id=current_user.id
-            ).first()
-            if not member:
-                return error_response("Access denied", status_code=403)
+        role = get_project_role(current_user.id, project_id)
+        if role is None:
+            return error_response("Access denied", status_code=403)
         
         query = query.filter(Tag.project_id == project_id)
     else:
@@ -55,15 +79,33 @@ def list_tags(current_user):
             )
         )
     
+    # Follow a cursor from a previous page without OFFSET or COUNT
+    if request.args.get('cursor'):
+        try:
+            pagination_data = paginate_keyset(query, TAG_SORT_KEY)
+        except ValueError as e:
+            return error_response(str(e), status_code=400)
+        
+        return success_response(
+            data={
+                'tags': tags_schema.dump(pagination_data['items']),
+                'pagination': {
+                    'per_page': pagination_data['per_page'],
+                    'has_next': pagination_data['next_cursor'] is not None,
+                    'next_cursor': pagination_data['next_cursor']
+                }
+            },
+            message="Tags retrieved successfully"
+        )
+    
     # Order by name
-    query = query.order_by(Tag.name)
+    query = query.order_by(Tag.name, Tag.id)
     
     # Paginate
-    pagination_data = paginate_query(query)
+    pagination_data = paginate_query_countless(query)
     
     # Serialize tags
-    tag_schema = TagSchema(many=True)
-    tags_data = tag_schema.dump(pagination_data['items'])
+    tags_data = tags_schema.dump(pagination_data['items'])
     
     return success_response(
         data={
@@ -71,8 +113,8 @@ def list_tags(current_user):
             'pagination': {
                 'page': pagination_data['page'],
                 'per_page': pagination_data['per_page'],
-                'total': pagination_data['total'],
-                'pages': (pagination_data['total'] + pagination_data['per_page'] - 1) // pagination_data['per_page']
+                'has_next': pagination_data['has_next'],
+                'next_cursor': encode_cursor(pagination_data['items'][-1], TAG_SORT_KEY) if pagination_data['has_next'] else None
             }
         },
         message="Tags retrieved successfully"
@@ -96,27 +138,13 @@ def create_tag(current_user, validated_data):
     
     # If project_id provided, check permissions
     if project_id:
-        project = get_or_404(Project, project_id)
+        get_or_404(Project, project_id)
         
-        if project.owner_id != current_user.id:
-            member = ProjectMember.query.filter_by(
-                project_id=project_id,
-                user_id=current_user.id
-            ).first()
-            if not member or member.role.value == 'viewer':
-                return error_response("Insufficient permissions to create tags", status_code=403)
+        role = get_project_role(current_user.id, project_id)
+        if role is None or role is MemberRole.VIEWER:
+            return error_response("Insufficient permissions to create tags", status_code=403)
     
     try:
-        # Check for duplicate tag name in same scope
-        existing_tag = Tag.query.filter_by(
-            name=validated_data['name'],
-            project_id=project_id
-        ).first()
-        
-        if existing_tag:
-            scope = "project" if project_id else "global"
-            return error_response(f"Tag '{validated_data['name']}' already exists in {scope} scope", status_code=400)
-        
         tag = Tag(
             name=validated_data['name'],
             color=validated_data.get('color'),
@@ -125,8 +153,8 @@ def create_tag(current_user, validated_data):
         
         db.session.add(tag)
         db.session.commit()
+        invalidate_cache('tags')
         
-        tag_schema = TagSchema()
         tag_data = tag_schema.dump(tag)
         
         return success_response(
@@ -135,6 +163,11 @@ def create_tag(current_user, validated_data):
             status_code=201
         )
         
+    except IntegrityError:
+        # uq_tags_scope_name: duplicate tag name in the same scope
+        db.session.rollback()
+        scope = "project" if project_id else "global"
+        return error_response(f"Tag '{validated_data['name']}' already exists in {scope} scope", status_code=400)
     except Exception as e:
         db.session.rollback()
         return error_response(f"Tag creation failed: {str(e)}", status_code=500)
@@ -156,37 +189,22 @@ def update_tag(current_user, tag_id, validated_data):
     
     # Check permissions
     if tag.project_id:
-        project = tag.project
-        if project.owner_id != current_user.id:
-            member = ProjectMember.query.filter_by(
-                project_id=tag.project_id,
-                user_id=current_user.id
-            ).first()
-            if not member or member.role.value == 'viewer':
-                return error_response("Insufficient permissions to update tag", status_code=403)
+        role = get_project_role(current_user.id, tag.project_id)
+        if role is None or role is MemberRole.VIEWER:
+            return error_response("Insufficient permissions to update tag", status_code=403)
     # Global tags can only be updated by system admins (not implemented yet)
     else:
         return error_response("Cannot update global tags", status_code=403)
     
     try:
-        # Check for duplicate name if name is being changed
-        if 'name' in validated_data and validated_data['name'] != tag.name:
-            existing_tag = Tag.query.filter_by(
-                name=validated_data['name'],
-                project_id=tag.project_id
-            ).first()
-            
-            if existing_tag:
-                return error_response(f"Tag '{validated_data['name']}' already exists", status_code=400)
-        
         # Update tag fields
         for field, value in validated_data.items():
-            if hasattr(tag, field):
+            if field in TAG_UPDATE_FIELDS:
                 setattr(tag, field, value)
         
         db.session.commit()
+        invalidate_cache('tags')
         
-        tag_schema = TagSchema()
         tag_data = tag_schema.dump(tag)
         
         return success_response(
@@ -194,6 +212,10 @@ def update_tag(current_user, tag_id, validated_data):
             message="Tag updated successfully"
         )
         
+    except IntegrityError:
+        # uq_tags_scope_name: duplicate tag name in the same scope
+        db.session.rollback()
+        return error_response(f"Tag '{validated_data['name']}' already exists", status_code=400)
     except Exception as e:
         db.session.rollback()
         return error_response(f"Tag update failed: {str(e)}", status_code=500)
@@ -210,22 +232,18 @@ def delete_tag(current_user, tag_id):
     
     # Check permissions
     if tag.project_id:
-        project = tag.project
-        if project.owner_id != current_user.id:
-            member = ProjectMember.query.filter_by(
-                project_id=tag.project_id,
-                user_id=current_user.id
-            ).first()
-            if not member or member.role.value == 'viewer':
-                return error_response("Insufficient permissions to delete tag", status_code=403)
+        role = get_project_role(current_user.id, tag.project_id)
+        if role is None or role is MemberRole.VIEWER:
+            return error_response("Insufficient permissions to delete tag", status_code=403)
     else:
         return error_response("Cannot delete global tags", status_code=403)
     
     try:
         db.session.delete(tag)
         db.session.commit()
+        invalidate_cache('tags')
         
-        return success_response(message="Tag deleted successfully")
+        return no_content_response()
         
     except Exception as e:
         db.session.rollback()
@@ -245,35 +263,52 @@ def add_tag_to_task(current_user, task_id):
     if not request.is_json or 'tag_ids' not in request.json:
         return error_response("tag_ids array is required", status_code=400)
     
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     tag_ids = request.json['tag_ids']
     
     # Check project access
     project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member or member.role.value == 'viewer':
-            return error_response("Insufficient permissions to modify task tags", status_code=403)
+    if role is None or role is MemberRole.VIEWER:
+        return error_response("Insufficient permissions to modify task tags", status_code=403)
     
     try:
+        tag_ids = list(dict.fromkeys(uuid.UUID(str(tag_id)) for tag_id in tag_ids))
+    except (TypeError, ValueError):
+        return error_response("tag_ids must be a list of tag IDs", status_code=400)
+    
+    # Nothing to link: skip the lookups and the transaction
+    if not tag_ids:
+        return success_response(message="No tags provided")
+    
+    try:
+        # Load all requested tags and existing links in two queries
+        tags_by_id = {tag.id: tag for tag in Tag.query.filter(Tag.id.in_(tag_ids)).all()}
+        existing_ids = {
+            tag_id for (tag_id,) in db.session.query(TaskTag.tag_id).filter(
+                TaskTag.task_id == task.id,
+                TaskTag.tag_id.in_(tag_ids)
+            )
+        }
+        
         added_tags = []
+        new_links = []
         for tag_id in tag_ids:
-            tag = get_or_404(Tag, tag_id)
+            tag = tags_by_id.get(tag_id)
+            if not tag:
+                return error_response("Tag not found", status_code=404)
             
             # Check if tag can be applied to this task
             if tag.project_id and tag.project_id != project.id:
                 return error_response(f"Tag '{tag.name}' belongs to a different project", status_code=400)
             
             # Check if already applied
-            existing = TaskTag.query.filter_by(task_id=task_id, tag_id=tag_id).first()
-            if not existing:
-                task_tag = TaskTag(task_id=task_id, tag_id=tag_id)
-                db.session.add(task_tag)
+            if tag_id not in existing_ids:
+                new_links.append({'task_id': task.id, 'tag_id': tag_id})
                 added_tags.append(tag.name)
         
+        # Single multi-row INSERT rather than one per tag
+        if new_links:
+            db.session.execute(insert(TaskTag), new_links)
         db.session.commit()
         
         message = f"Added tags: {', '.join(added_tags)}" if added_tags else "No new tags added"
@@ -291,28 +326,22 @@ def remove_tag_from_task(current_user, task_id, tag_id):
     
     DELETE /api/tags/tasks/{task_id}/tags/{tag_id}
     """
-    task = get_or_404(Task, task_id)
-    tag = get_or_404(Tag, tag_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     
     # Check project access
-    project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member or member.role.value == 'viewer':
-            return error_response("Insufficient permissions to modify task tags", status_code=403)
+    if role is None or role is MemberRole.VIEWER:
+        return error_response("Insufficient permissions to modify task tags", status_code=403)
     
     try:
-        task_tag = TaskTag.query.filter_by(task_id=task_id, tag_id=tag_id).first()
-        if not task_tag:
+        # Delete the link directly; the row count tells us whether it existed
+        deleted = TaskTag.query.filter_by(task_id=task.id, tag_id=tag_id).delete(synchronize_session=False)
+        if not deleted:
+            db.session.rollback()
             return error_response("Tag is not applied to this task", status_code=404)
         
-        db.session.delete(task_tag)
         db.session.commit()
         
-        return success_response(message=f"Tag '{tag.name}' removed from task")
+        return no_content_response()
         
     except Exception as e:
         db.session.rollback()
@@ -4,32 +4,109 @@ Task management API endpoints
 
 from flask import Blueprint, request
 from datetime import datetime
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm import joinedload
 from app import db
-from app.models import Task, Project, User, Tag, TaskTag, TaskStatus, TaskPriority, ActivityLog, ActivityAction
-from app.schemas import TaskSchema, TaskCreateSchema, TaskUpdateSchema, TaskStatusUpdateSchema, TaskAssignSchema
-from app.utils.responses import success_response, error_response
-from app.utils.decorators import jwt_required_with_user, permission_required
-from app.utils.helpers import validate_json, get_or_404, paginate_query, get_request_filters, apply_task_filters
+from app.models import Task, Project, ProjectMember, MemberRole, User, Tag, TaskTag, TaskStatus, TaskPriority, ActivityLog, ActivityAction
+from app.schemas import TaskSchema, TaskCreateSchema, TaskUpdateSchema, TaskStatusUpdateSchema, TaskAssignSchema, ActivityLogSchema
+from app.utils.responses import success_response, error_response, no_content_response
+from app.utils.cache import cached, invalidate_cache
+from app.utils.decorators import jwt_required_with_user, permission_required, conditional_get
+from app.utils.permissions import get_project_role, load_task_with_access
+from app.utils.transactions import transaction
+from app.utils.helpers import (
+    validate_json, get_or_404, paginate_query_countless, strict_load_options, paginate_keyset, encode_cursor, get_request_filters, apply_task_filters
+)
 
 tasks_bp = Blueprint('tasks', __name__)
 
+task_schema = TaskSchema()
+tasks_schema = TaskSchema(many=True)
+activities_schema = ActivityLogSchema(many=True)
+
+# Unique sort keys for keyset pagination cursors
+TASK_SORT_KEY = (Task.updated_at, Task.id)
+ACTIVITY_SORT_KEY = (ActivityLog.created_at, ActivityLog.id)
+
+# Columns update_task may set, and the enums their string values map to
+TASK_UPDATE_FIELDS = frozenset({
+    'title', 'description', 'assignee_id', 'status', 'priority',
+    'due_date', 'estimated_hours', 'actual_hours'
+})
+TASK_ENUM_FIELDS = {'status': TaskStatus, 'priority': TaskPriority}
+
+def _can_view_task(current_user, task_id, **kwargs) -> bool:
+    """Access check run before cached task responses are served"""
+    _, role = load_task_with_access(task_id, current_user.id)
+    return role is not None
+
+def _task_list_options() -> list:
+    """
+    Loader options for serializing task lists without per-row queries
+    
+    Returns:
+        List of loader options
+    """
+    return strict_load_options(joinedload(Task.project), joinedload(Task.assignee), joinedload(Task.creator))
+
+def _accessible_project_ids(user_id):
+    """
+    IDs of projects the user owns or is a member of
+    
+    Resolved as one UNION with no join to projects, for use in
+    Task.project_id.in_(...).
+    
+    Args:
+        user_id: User ID
+        
+    Returns:
+        Query yielding project IDs
+    """
+    return db.session.query(Project.id).filter(
+        Project.owner_id == user_id
+    ).union(
+        db.session.query(ProjectMember.project_id).filter(
+            ProjectMember.user_id == user_id
+        )
+    )
+
+def _link_tags(task_id, tag_ids) -> bool:
+    """
+    Link tags to a task with one existence check and one bulk INSERT
+    
+    Args:
+        task_id: Task ID
+        tag_ids: Tag IDs to link (duplicates are ignored)
+        
+    Returns:
+        False if any tag does not exist, in which case nothing is linked
+    """
+    tag_ids = list(dict.fromkeys(tag_ids))
+    if not tag_ids:
+        return True
+    
+    found = db.session.query(Tag.id).filter(Tag.id.in_(tag_ids)).count()
+    if found != len(tag_ids):
+        return False
+    
+    db.session.execute(
+        insert(TaskTag),
+        [{'task_id': task_id, 'tag_id': tag_id} for tag_id in tag_ids]
+    )
+    return True
+
 @tasks_bp.route('', methods=['GET'])
+@conditional_get
 @jwt_required_with_user
 def list_tasks(current_user):
     """
     List all tasks with filtering and pagination
     
     GET /api/tasks?project_id=xxx&status=todo&priority=high&assignee_id=xxx&page=1&per_page=20
+    GET /api/tasks?cursor=<next_cursor>&per_page=20  (keyset pagination)
     """
     # Base query for user's accessible tasks
-    query = Task.query.join(Project).filter(
-        (Project.owner_id == current_user.id) |
-        (Project.id.in_(
-            db.session.query(db.session.query(ProjectMember.project_id).filter_by(
-                user_id=current_user.id
-            ).subquery())
-        ))
-    )
+    query = Task.query.filter(Task.project_id.in_(_accessible_project_ids(current_user.id)))
     
     # Apply filters
     if request.args.get('project_id'):
@@ -38,15 +115,43 @@ def list_tasks(current_user):
     filters = get_request_filters()
     query = apply_task_filters(query, filters)
     
+    # Follow a cursor from a previous page without OFFSET or COUNT
+    if request.args.get('cursor'):
+        try:
+            pagination_data = paginate_keyset(
+                query.options(*_task_list_options()),
+                TASK_SORT_KEY,
+                descending=True
+            )
+        except ValueError as e:
+            return error_response(str(e), status_code=400)
+        
+        return success_response(
+            data={
+                'tasks': tasks_schema.dump(pagination_data['items']),
+                'pagination': {
+                    'per_page': pagination_data['per_page'],
+                    'has_next': pagination_data['next_cursor'] is not None,
+                    'next_cursor': pagination_data['next_cursor']
+                }
+            },
+            message="Tasks retrieved successfully"
+        )
+    
     # Order by updated_at
-    query = query.order_by(Task.updated_at.desc())
+    ordering = (Task.updated_at.desc(), Task.id.desc())
+    query = query.order_by(*ordering)
     
-    # Paginate
-    pagination_data = paginate_query(query)
+    # Paginate over IDs only (deferred join), so skipped rows are never
+    # materialized, then load full rows for just this page
+    pagination_data = paginate_query_countless(query.with_entities(Task.id))
+    page_ids = [row[0] for row in pagination_data['items']]
+    tasks = Task.query.filter(Task.id.in_(page_ids)).options(
+        *_task_list_options()
+    ).order_by(*ordering).all() if page_ids else []
     
     # Serialize tasks
-    task_schema = TaskSchema(many=True)
-    tasks_data = task_schema.dump(pagination_data['items'])
+    tasks_data = tasks_schema.dump(tasks)
     
     return success_response(
         data={
@@ -54,13 +159,37 @@ def list_tasks(current_user):
             'pagination': {
                 'page': pagination_data['page'],
                 'per_page': pagination_data['per_page'],
-                'total': pagination_data['total'],
-                'pages': (pagination_data['total'] + pagination_data['per_page'] - 1) // pagination_data['per_page']
+                'has_next': pagination_data['has_next'],
+                'next_cursor': encode_cursor(tasks[-1], TASK_SORT_KEY) if pagination_data['has_next'] else None
             }
         },
         message="Tasks retrieved successfully"
     )
 
+@tasks_bp.route('/stats', methods=['GET'])
+@jwt_required_with_user
+def task_stats(current_user):
+    """
+    Count the user's accessible tasks by status
+    
+    GET /api/tasks/stats
+    """
+    # All counters come from one aggregate over the accessible tasks
+    stats = db.session.query(
+        func.count().label('total'),
+        func.count().filter(Task.status == TaskStatus.TODO).label('pending'),
+        func.count().filter(Task.status == TaskStatus.DONE).label('completed')
+    ).filter(Task.project_id.in_(_accessible_project_ids(current_user.id))).one()
+    
+    return success_response(
+        data={
+            'total_tasks': stats.total,
+            'pending_tasks': stats.pending,
+            'completed_tasks': stats.completed
+        },
+        message="Task statistics retrieved successfully"
+    )
+
 @tasks_bp.route('', methods=['POST'])
 @jwt_required_with_user
 @validate_json(TaskCreateSchema)
@@ -87,13 +216,9 @@ def create_task(current_user, validated_data):
     project = get_or_404(Project, project_id)
     
     # Verify project access
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project_id,
-            user_id=current_user.id
-        ).first()
-        if not member or member.role == MemberRole.VIEWER:
-            return error_response("Insufficient permissions to create tasks", status_code=403)
+    role = get_project_role(current_user.id, project_id)
+    if role is None or role is MemberRole.VIEWER:
+        return error_response("Insufficient permissions to create tasks", status_code=403)
     
     try:
         task = Task(
@@ -112,11 +237,10 @@ def create_task(current_user, validated_data):
         db.session.flush()  # Get task ID
         
         # Add tags if provided
-        tag_ids = validated_data.get('tag_ids', [])
-        for tag_id in tag_ids:
-            tag = get_or_404(Tag, tag_id)
-            task_tag = TaskTag(task_id=task.id, tag_id=tag.id)
-            db.session.add(task_tag)
+        tag_ids = validated_data.get('tag_ids')
+        if tag_ids and not _link_tags(task.id, tag_ids):
+            db.session.rollback()
+            return error_response("Tag not found", status_code=404)
         
         # Log activity
         ActivityLog.log_activity(
@@ -128,8 +252,8 @@ def create_task(current_user, validated_data):
         )
         
         db.session.commit()
+        invalidate_cache('projects')
         
-        task_schema = TaskSchema()
         task_data = task_schema.dump(task)
         
         return success_response(
@@ -144,25 +268,19 @@ def create_task(current_user, validated_data):
 
 @tasks_bp.route('/<task_id>', methods=['GET'])
 @jwt_required_with_user
+@cached('task:{task_id}', access=_can_view_task)
 def get_task(current_user, task_id):
     """
     Get task details
     
     GET /api/tasks/{task_id}
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     
     # Check project access
-    project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member:
-            return error_response("Access denied", status_code=403)
-    
-    task_schema = TaskSchema()
+    if role is None:
+        return error_response("Access denied", status_code=403)
+    
     task_data = task_schema.dump(task)
     
     return success_response(
@@ -185,49 +303,37 @@ def update_task(current_user, task_id, validated_data):
         "priority": "high"
     }
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     
     # Check project access
     project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member or member.role == MemberRole.VIEWER:
-            return error_response("Insufficient permissions to update task", status_code=403)
+    if role is None or role is MemberRole.VIEWER:
+        return error_response("Insufficient permissions to update task", status_code=403)
     
     try:
         # Track changes for activity log
         changes = {}
         
-        # Update task fields
+        # Update task fields (tag_ids is handled separately)
         for field, value in validated_data.items():
-            if field == 'tag_ids':
-                continue  # Handle separately
+            if field not in TASK_UPDATE_FIELDS:
+                continue
+            
+            if field in TASK_ENUM_FIELDS:
+                value = TASK_ENUM_FIELDS[field](value)
             
-            if hasattr(task, field):
-                old_value = getattr(task, field)
-                if field in ['status', 'priority'] and isinstance(value, str):
-                    if field == 'status':
-                        value = TaskStatus(value)
-                    elif field == 'priority':
-                        value = TaskPriority(value)
-                
-                if old_value != value:
-                    changes[field] = {'old': str(old_value), 'new': str(value)}
-                    setattr(task, field, value)
+            old_value = getattr(task, field)
+            if old_value != value:
+                changes[field] = {'old': str(old_value), 'new': str(value)}
+                setattr(task, field, value)
         
         # Handle tag updates
         if 'tag_ids' in validated_data:
-            # Remove existing tags
-            TaskTag.query.filter_by(task_id=task.id).delete()
-            
-            # Add new tags
-            for tag_id in validated_data['tag_ids']:
-                tag = get_or_404(Tag, tag_id)
-                task_tag = TaskTag(task_id=task.id, tag_id=tag.id)
-                db.session.add(task_tag)
+            # Replace existing tags
+            TaskTag.query.filter_by(task_id=task.id).delete(synchronize_session=False)
+            if not _link_tags(task.id, validated_data['tag_ids']):
+                db.session.rollback()
+                return error_response("Tag not found", status_code=404)
         
         # Mark as completed if status changed to done
         if 'status' in changes and changes['status']['new'] == 'TaskStatus.DONE':
@@ -244,8 +350,8 @@ def update_task(current_user, task_id, validated_data):
             )
         
         db.session.commit()
+        invalidate_cache(f'task:{task_id}')
         
-        task_schema = TaskSchema()
         task_data = task_schema.dump(task)
         
         return success_response(
@@ -265,17 +371,12 @@ def delete_task(current_user, task_id):
     
     DELETE /api/tasks/{task_id}
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     
     # Check project access and permissions
     project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member or member.role == MemberRole.VIEWER:
-            return error_response("Insufficient permissions to delete task", status_code=403)
+    if role is None or role is MemberRole.VIEWER:
+        return error_response("Insufficient permissions to delete task", status_code=403)
     
     try:
         # Log activity before deletion
@@ -288,8 +389,10 @@ def delete_task(current_user, task_id):
         
         db.session.delete(task)
         db.session.commit()
+        invalidate_cache(f'task:{task_id}')
+        invalidate_cache('projects')
         
-        return success_response(message="Task deleted successfully")
+        return no_content_response()
         
     except Exception as e:
         db.session.rollback()
@@ -307,18 +410,13 @@ def update_task_status(current_user, task_id, validated_data):
         "status": "in_progress"
     }
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     new_status = TaskStatus(validated_data['status'])
     
     # Check project access
     project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member:
-            return error_response("Access denied", status_code=403)
+    if role is None:
+        return error_response("Access denied", status_code=403)
     
     try:
         old_status = task.status
@@ -343,8 +441,8 @@ def update_task_status(current_user, task_id, validated_data):
         )
         
         db.session.commit()
+        invalidate_cache(f'task:{task_id}')
         
-        task_schema = TaskSchema()
         task_data = task_schema.dump(task)
         
         return success_response(
@@ -368,28 +466,27 @@ def assign_task(current_user, task_id, validated_data):
         "assignee_id": "user-uuid"
     }
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     assignee_id = validated_data['assignee_id']
     
     # Check project access
     project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member or member.role == MemberRole.VIEWER:
-            return error_response("Insufficient permissions to assign task", status_code=403)
-    
-    # Verify assignee exists and has project access
-    assignee = get_or_404(User, assignee_id)
-    if project.owner_id != assignee.id:
-        assignee_member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=assignee_id
-        ).first()
-        if not assignee_member:
-            return error_response("Assignee is not a project member", status_code=400)
+    if role is None or role is MemberRole.VIEWER:
+        return error_response("Insufficient permissions to assign task", status_code=403)
+    
+    # Verify assignee exists and has project access in one query
+    row = db.session.query(User, ProjectMember.user_id.isnot(None)).outerjoin(
+        ProjectMember,
+        and_(
+            ProjectMember.user_id == User.id,
+            ProjectMember.project_id == project.id
+        )
+    ).filter(User.id == assignee_id).first()
+    if row is None:
+        return error_response("User not found", status_code=404)
+    assignee, is_member = row
+    if not is_member and project.owner_id != assignee.id:
+        return error_response("Assignee is not a project member", status_code=400)
     
     try:
         old_assignee_id = task.assignee_id
@@ -408,8 +505,8 @@ def assign_task(current_user, task_id, validated_data):
         )
         
         db.session.commit()
+        invalidate_cache(f'task:{task_id}')
         
-        task_schema = TaskSchema()
         task_data = task_schema.dump(task)
         
         return success_response(
@@ -429,33 +526,28 @@ def complete_task(current_user, task_id):
     
     POST /api/tasks/{task_id}/complete
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     
     # Check project access
     project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member:
-            return error_response("Access denied", status_code=403)
+    if role is None:
+        return error_response("Access denied", status_code=403)
     
     try:
-        task.mark_complete()
-        
-        # Log activity
-        ActivityLog.log_activity(
-            user=current_user,
-            project=project,
-            task=task,
-            action=ActivityAction.COMPLETED,
-            details={'task_title': task.title}
-        )
+        with transaction():
+            task.mark_complete()
+            
+            # Log activity
+            ActivityLog.log_activity(
+                user=current_user,
+                project=project,
+                task=task,
+                action=ActivityAction.COMPLETED,
+                details={'task_title': task.title}
+            )
         
-        db.session.commit()
+        invalidate_cache(f'task:{task_id}')
         
-        task_schema = TaskSchema()
         task_data = task_schema.dump(task)
         
         return success_response(
@@ -468,45 +560,46 @@ def complete_task(current_user, task_id):
         return error_response(f"Task completion failed: {str(e)}", status_code=500)
 
 @tasks_bp.route('/<task_id>/history', methods=['GET'])
+@conditional_get
 @jwt_required_with_user
+@cached('task:{task_id}', access=_can_view_task)
 def get_task_history(current_user, task_id):
     """
     Get task activity history
     
-    GET /api/tasks/{task_id}/history
+    GET /api/tasks/{task_id}/history?per_page=50&cursor=<next_cursor>
     """
-    task = get_or_404(Task, task_id)
+    task, role = load_task_with_access(task_id, current_user.id)
     
     # Check project access
-    project = task.project
-    if project.owner_id != current_user.id:
-        member = ProjectMember.query.filter_by(
-            project_id=project.id,
-            user_id=current_user.id
-        ).first()
-        if not member:
-            return error_response("Access denied", status_code=403)
-    
-    # Get activity logs for this task
-    activities = ActivityLog.query.filter_by(task_id=task_id).order_by(
-        ActivityLog.created_at.desc()
-    ).all()
-    
-    activities_data = []
-    for activity in activities:
-        activities_data.append({
-            'id': str(activity.id),
-            'action': activity.action.value,
-            'user': {
-                'id': str(activity.user.id),
-                'username': activity.user.username,
-                'full_name': activity.user.full_name
-            },
-            'details': activity.details,
-            'created_at': activity.created_at.isoformat()
-        })
+    if role is None:
+        return error_response("Access denied", status_code=403)
+    
+    # Get one page of activity logs for this task, with their users in the same query
+    query = ActivityLog.query.options(
+        joinedload(ActivityLog.user).load_only(User.id, User.username, User.full_name)
+    ).filter(ActivityLog.task_id == task.id)
+    
+    try:
+        pagination_data = paginate_keyset(
+            query,
+            ACTIVITY_SORT_KEY,
+            descending=True,
+            per_page=request.args.get('per_page', 50, type=int)
+        )
+    except ValueError as e:
+        return error_response(str(e), status_code=400)
+    
+    activities_data = activities_schema.dump(pagination_data['items'])
     
     return success_response(
-        data={'activities': activities_data},
+        data={
+            'activities': activities_data,
+            'pagination': {
+                'per_page': pagination_data['per_page'],
+                'has_next': pagination_data['next_cursor'] is not None,
+                'next_cursor': pagination_data['next_cursor']
+            }
+        },
         message="Task history retrieved successfully"
     )
\ No newline at end of file
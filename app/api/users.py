@@ -5,13 +5,20 @@ User management API endpoints
 from flask import Blueprint, request
 from app import db
 from app.models import User
-from app.schemas import UserSchema, UserUpdateSchema, ChangePasswordSchema
+from app.models.user import USER_SEARCH_TEXT
+from app.schemas import UserUpdateSchema, ChangePasswordSchema
 from app.utils.responses import success_response, error_response
+from app.utils.cache import invalidate_cache
 from app.utils.decorators import jwt_required_with_user
-from app.utils.helpers import validate_json, get_or_404, paginate_query
+from app.utils.helpers import validate_json, get_or_404, paginate_query, strict_load_options
+from app.utils.transactions import transaction
+from app.utils.user_cache import dump_user, dump_users
 
 users_bp = Blueprint('users', __name__)
 
+# Columns update_profile may set
+USER_UPDATE_FIELDS = frozenset({'full_name', 'avatar_url'})
+
 @users_bp.route('/profile', methods=['GET'])
 @jwt_required_with_user
 def get_profile(current_user):
@@ -20,8 +27,7 @@ def get_profile(current_user):
     
     GET /api/users/profile
     """
-    user_schema = UserSchema()
-    user_data = user_schema.dump(current_user)
+    user_data = dump_user(current_user)
     
     return success_response(
         data=user_data,
@@ -43,14 +49,14 @@ def update_profile(current_user, validated_data):
     """
     try:
         # Update user fields
-        for field, value in validated_data.items():
-            if hasattr(current_user, field):
-                setattr(current_user, field, value)
-        
-        db.session.commit()
+        with transaction():
+            for field, value in validated_data.items():
+                if field in USER_UPDATE_FIELDS:
+                    setattr(current_user, field, value)
+        # Project listings embed the owner's full name
+        invalidate_cache('projects')
         
-        user_schema = UserSchema()
-        user_data = user_schema.dump(current_user)
+        user_data = dump_user(current_user)
         
         return success_response(
             data=user_data,
@@ -77,14 +83,17 @@ def change_password(current_user, validated_data):
     current_password = validated_data['current_password']
     new_password = validated_data['new_password']
     
-    # Verify current password
-    if not current_user.check_password(current_password):
-        return error_response("Current password is incorrect", status_code=400)
-    
     try:
-        # Set new password
-        current_user.set_password(new_password)
-        db.session.commit()
+        # One commit covers both the legacy hash upgrade check_password may
+        # save and the new password
+        with transaction():
+            # Verify current password; the full KDF runs whether or not it matches,
+            # and both Argon2 and legacy hashes are compared in constant time
+            if not current_user.check_password(current_password):
+                return error_response("Current password is incorrect", status_code=400)
+            
+            # Set new password
+            current_user.set_password(new_password)
         
         return success_response(message="Password changed successfully")
         
@@ -107,20 +116,18 @@ def search_users(current_user):
     if len(search_term) < 2:
         return error_response("Search term must be at least 2 characters", status_code=400)
     
-    # Build search query
-    search_pattern = f"%{search_term}%"
+    # Build search query: one LIKE over the trigram-indexed search text
+    search_pattern = f"%{search_term.lower()}%"
     query = User.query.filter(
-        (User.username.ilike(search_pattern)) |
-        (User.email.ilike(search_pattern)) |
-        (User.full_name.ilike(search_pattern))
-    ).filter(User.is_active == True)
+        USER_SEARCH_TEXT.like(search_pattern),
+        User.is_active == True
+    )
     
     # Paginate results
-    pagination_data = paginate_query(query)
+    pagination_data = paginate_query(query, load_options=strict_load_options())
     
     # Serialize users
-    user_schema = UserSchema(many=True)
-    users_data = user_schema.dump(pagination_data['items'])
+    users_data = dump_users(pagination_data['items'])
     
     return success_response(
         data={
@@ -143,13 +150,12 @@ def get_user(current_user, user_id):
     
     GET /api/users/{user_id}
     """
-    user = get_or_404(User, user_id)
+    user = get_or_404(User, user_id, load_options=strict_load_options())
     
     if not user.is_active:
         return error_response("User not found", status_code=404)
     
-    user_schema = UserSchema()
-    user_data = user_schema.dump(user)
+    user_data = dump_user(user)
     
     return success_response(
         data=user_data,
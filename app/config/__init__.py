@@ -10,15 +10,63 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'postgresql://localhost/task_manager_dev'
+    # Per worker process, so size the pool from the connection budget:
+    #   instances x workers x (pool_size + max_overflow) <= max_connections
+    # e.g. 2 instances x 2 workers x 5 = 20 fits the ~22 connections of a
+    # db-s-1vcpu-1gb database. Sessions are returned by Flask-SQLAlchemy's
+    # teardown; pre-ping and recycling avoid errors on stale connections,
+    # LIFO keeps idle connections few so the server can close them.
+    # Waits for a pooled connection, a new connection and each statement are
+    # bounded so a stalled database fails requests instead of pinning every
+    # worker; set DB_STATEMENT_TIMEOUT_MS=0 for long-running migrations
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 0)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+        'pool_use_lifo': True,
+        'connect_args': {
+            'connect_timeout': 5,
+            'options': f"-c statement_timeout={int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))}"
+        }
+    }
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
+    # HS256 is the cheapest algorithm to sign and verify; asymmetric ones
+    # (EdDSA rather than RS256 if needed) take a PEM key pair instead
+    JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
+    JWT_PRIVATE_KEY = os.environ.get('JWT_PRIVATE_KEY')
+    JWT_PUBLIC_KEY = os.environ.get('JWT_PUBLIC_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
+    # Redis (token blocklist); features relying on it are disabled when unset
+    REDIS_URL = os.environ.get('REDIS_URL')
+    
     # Application settings
     ITEMS_PER_PAGE = 20
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    LAST_LOGIN_UPDATE_INTERVAL = 60  # Seconds between last_login writes per user
+    # Skip re-hashing for repeated successful logins within 30s (opt-in)
+    PASSWORD_CHECK_CACHE_ENABLED = os.environ.get('PASSWORD_CHECK_CACHE_ENABLED', 'false').lower() == 'true'
+    # Argon2id password hashing cost; existing hashes are upgraded on login
+    ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', 2))
+    ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', 46 * 1024))  # KiB
+    ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', 1))
+    # Write activity logs from `flask activity-worker` instead of in the request (needs REDIS_URL)
+    ACTIVITY_LOG_ASYNC = os.environ.get('ACTIVITY_LOG_ASYNC', 'false').lower() == 'true'
+    # Socket.IO packet encoding: 'default' (JSON) or 'msgpack'; msgpack needs
+    # the msgpack package and clients using socket.io-msgpack-parser
+    WEBSOCKET_SERIALIZER = os.environ.get('WEBSOCKET_SERIALIZER', 'default')
+    # Socket.IO concurrency: 'gevent' to match the gunicorn workers, or 'threading'
+    WEBSOCKET_ASYNC_MODE = os.environ.get('WEBSOCKET_ASYNC_MODE', 'gevent')
+    # Engine.IO heartbeat, in seconds
+    WEBSOCKET_PING_INTERVAL = int(os.environ.get('WEBSOCKET_PING_INTERVAL', 25))
+    WEBSOCKET_PING_TIMEOUT = int(os.environ.get('WEBSOCKET_PING_TIMEOUT', 60))
+    # Log every Socket.IO/Engine.IO packet (debugging only)
+    WEBSOCKET_LOGGING = os.environ.get('WEBSOCKET_LOGGING', 'false').lower() == 'true'
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -34,6 +82,9 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'postgresql://localhost/task_manager_test'
+    # Expose statements via flask_sqlalchemy.record_queries.get_recorded_queries()
+    # so tests can assert per-request query counts
+    SQLALCHEMY_RECORD_QUERIES = True
 
 config = {
     'development': DevelopmentConfig,
@@ -11,6 +11,27 @@ from app.models.tag import Tag
 from app.models.task_tag import TaskTag
 from app.models.project_member import ProjectMember, MemberRole
 from app.models.activity_log import ActivityLog, ActivityAction
+from sqlalchemy import func, select
+from sqlalchemy.orm import column_property
+
+# Aggregate counts serialized with tasks and projects, loaded as correlated
+# subqueries in the same SELECT instead of one COUNT query per row
+Task.comments_count = column_property(
+    select(func.count()).select_from(Comment).where(Comment.task_id == Task.id)
+    .correlate_except(Comment).scalar_subquery()
+)
+# Deferred: projects are often loaded only for their name (e.g. nested in
+# task lists); touching either count loads both in one query
+Project.tasks_count = column_property(
+    select(func.count()).select_from(Task).where(Task.project_id == Project.id)
+    .correlate_except(Task).scalar_subquery(),
+    deferred=True, group='counts'
+)
+Project.members_count = column_property(
+    select(func.count()).select_from(ProjectMember).where(ProjectMember.project_id == Project.id)
+    .correlate_except(ProjectMember).scalar_subquery(),
+    deferred=True, group='counts'
+)
 
 __all__ = [
     'BaseModel',
@@ -1,7 +1,8 @@
 from datetime import datetime
-from sqlalchemy import Column, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, ForeignKey, Enum, DateTime, Index, insert
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import enum
+import uuid
 from app.models.base import BaseModel
 from app import db
 
@@ -34,18 +35,61 @@ class ActivityLog(BaseModel):
     project = db.relationship('Project', back_populates='activities')
     task = db.relationship('Task', back_populates='activities')
     
+    @staticmethod
+    def _entry_values(user, project, action, task=None, details=None):
+        """Column values for one activity log entry"""
+        return {
+            'id': uuid.uuid4(),
+            'user_id': user.id,
+            'project_id': project.id,
+            'task_id': task.id if task else None,
+            'action': action,
+            'details': details or {},
+            'created_at': datetime.utcnow()
+        }
+    
     @classmethod
     def log_activity(cls, user, project, action, task=None, details=None):
-        """Helper method to create an activity log entry"""
-        activity = cls(
-            user_id=user.id,
-            project_id=project.id,
-            task_id=task.id if task else None,
-            action=action,
-            details=details or {}
-        )
+        """
+        Helper method to create an activity log entry
+        
+        With ACTIVITY_LOG_ASYNC enabled the entry is queued and written by the
+        activity worker once the request commits, and None is returned.
+        """
+        from app.utils.activity_queue import queue_activity
+        
+        values = cls._entry_values(user, project, action, task, details)
+        if queue_activity(values):
+            return None
+        
+        activity = cls(**values)
         db.session.add(activity)
         return activity
     
+    @classmethod
+    def log_activities_bulk(cls, entries):
+        """
+        Record many activity log entries with one INSERT
+        
+        Rows go straight to the database in the current transaction without
+        creating ORM instances, so nothing is returned. Entries are queued
+        instead when ACTIVITY_LOG_ASYNC is enabled.
+        
+        Args:
+            entries: Dicts of log_activity keyword arguments (user, project,
+                action, and optionally task and details)
+        """
+        from app.utils.activity_queue import queue_activity
+        
+        rows = [
+            values for values in (cls._entry_values(**entry) for entry in entries)
+            if not queue_activity(values)
+        ]
+        if rows:
+            db.session.execute(insert(cls), rows)
+    
     def __repr__(self):
-        return f'<ActivityLog {self.action.value} by {self.user_id}>'
\ No newline at end of file
+        return f'<ActivityLog {self.action.value} by {self.user_id}>'
+
+# Newest-first keyset pagination of a task's history
+Index('ix_activity_logs_task_created', ActivityLog.task_id, ActivityLog.created_at.desc(), ActivityLog.id.desc())
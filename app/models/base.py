@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, event
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from app import db
@@ -12,16 +12,48 @@ class BaseModel(db.Model):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def save(self):
-        """Save the record to database"""
+    def save(self, commit=True):
+        """
+        Save the record to database
+        
+        Args:
+            commit: Commit immediately; ignored inside a transaction() block,
+                where the change is only flushed
+        """
         db.session.add(self)
-        db.session.commit()
+        self._finish_write(commit)
     
-    def delete(self):
-        """Delete the record from database"""
+    def delete(self, commit=True):
+        """
+        Delete the record from database
+        
+        Args:
+            commit: Commit immediately; ignored inside a transaction() block,
+                where the change is only flushed
+        """
         db.session.delete(self)
-        db.session.commit()
+        self._finish_write(commit)
+    
+    @staticmethod
+    def _finish_write(commit):
+        """Commit, or flush when the caller owns the transaction"""
+        from app.utils.transactions import in_transaction
+        
+        if commit and not in_transaction():
+            db.session.commit()
+        else:
+            db.session.flush()
     
     def to_dict(self):
         """Convert model to dictionary"""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        # Loaded values live in __dict__; only unloaded ones go through the descriptor
+        values = self.__dict__
+        return {
+            name: values[name] if name in values else getattr(self, name)
+            for name in self._column_names
+        }
+
+@event.listens_for(BaseModel, 'mapper_configured', propagate=True)
+def _cache_column_names(mapper, cls):
+    """Record each model's column names once, for to_dict"""
+    cls._column_names = tuple(c.name for c in cls.__table__.columns)
\ No newline at end of file
@@ -7,7 +7,7 @@ class Comment(BaseModel):
     """Comment model for task comments"""
     __tablename__ = 'comments'
     
-    task_id = Column(UUID(as_uuid=True), ForeignKey('tasks.id'), nullable=False)
+    task_id = Column(UUID(as_uuid=True), ForeignKey('tasks.id'), nullable=False, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     content = Column(Text, nullable=False)
     is_edited = Column(Boolean, default=False, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, Text
+from sqlalchemy import Column, String, Boolean, ForeignKey, Text, Index, exists, false
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import BaseModel
 from app import db
@@ -9,7 +9,7 @@ class Project(BaseModel):
     
     name = Column(String(100), nullable=False)
     description = Column(Text)
-    owner_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
     color = Column(String(7))  # Hex color code
     icon = Column(String(50))
     is_archived = Column(Boolean, default=False, nullable=False)
@@ -45,9 +45,18 @@ class Project(BaseModel):
     def is_member(self, user):
         """Check if user is a project member"""
         from app.models.project_member import ProjectMember
-        return ProjectMember.query.filter_by(
-            project_id=self.id, user_id=user.id
-        ).first() is not None
+        return db.session.query(exists().where(
+            ProjectMember.project_id == self.id,
+            ProjectMember.user_id == user.id
+        )).scalar()
     
     def __repr__(self):
-        return f'<Project {self.name}>'
\ No newline at end of file
+        return f'<Project {self.name}>'
+
+# Partial index for the default (non-archived) project listing, newest first
+Index(
+    'ix_projects_active_owner_updated',
+    Project.owner_id,
+    Project.updated_at.desc(),
+    postgresql_where=Project.is_archived == false()
+)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, ForeignKey, DateTime, Enum, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, DateTime, Enum, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 import enum
 from app import db
@@ -24,6 +24,9 @@ class ProjectMember(db.Model):
     
     __table_args__ = (
         UniqueConstraint('project_id', 'user_id', name='_project_member_uc'),
+        # The (project_id, user_id) primary key serves "is user in project";
+        # this serves "projects for user" lookups
+        Index('ix_project_members_user_project', 'user_id', 'project_id'),
     )
     
     def __repr__(self):
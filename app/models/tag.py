@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index, cast, func
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import BaseModel
 from app import db
@@ -17,4 +17,18 @@ class Tag(BaseModel):
                                cascade='all, delete-orphan')
     
     def __repr__(self):
-        return f'<Tag {self.name}>'
\ No newline at end of file
+        return f'<Tag {self.name}>'
+
+# Sort key for keyset pagination of tag listings
+Index('ix_tags_name_id', Tag.name, Tag.id)
+
+# Per-project tag listings (project_id = ? / IN (...)), already in sort order
+Index('ix_tags_project_name_id', Tag.project_id, Tag.name, Tag.id)
+
+# Tag names are unique per project, and among global (project-less) tags
+Index(
+    'uq_tags_scope_name',
+    func.coalesce(cast(Tag.project_id, String), ''),
+    Tag.name,
+    unique=True
+)
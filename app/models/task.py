@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Text, Enum, DateTime, Float
+from sqlalchemy import Column, String, ForeignKey, Text, Enum, DateTime, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 import enum
 from app.models.base import BaseModel
@@ -22,7 +22,7 @@ class Task(BaseModel):
     
     title = Column(String(200), nullable=False)
     description = Column(Text)
-    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id'), nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id'), nullable=False, index=True)
     assignee_id = Column(UUID(as_uuid=True), ForeignKey('users.id'))
     creator_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False)
@@ -74,4 +74,17 @@ class Task(BaseModel):
             db.session.delete(task_tag)
     
     def __repr__(self):
-        return f'<Task {self.title}>'
\ No newline at end of file
+        return f'<Task {self.title}>'
+
+# Sort key for keyset pagination of task listings
+Index('ix_tasks_updated_at_id', Task.updated_at.desc(), Task.id.desc())
+
+# Trigram index for the search filter's ILIKE '%term%' on title and
+# description; pg_trgm is created with the users table, which tasks references
+Index(
+    'ix_tasks_search_trgm',
+    Task.title,
+    Task.description,
+    postgresql_using='gin',
+    postgresql_ops={'title': 'gin_trgm_ops', 'description': 'gin_trgm_ops'}
+)
@@ -1,9 +1,67 @@
+import os
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime
-from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHash, VerificationError
+from flask import current_app, has_app_context
+from sqlalchemy import Column, String, Boolean, DateTime, DDL, Index, event, func, literal_column
+from werkzeug.security import check_password_hash
 from app.models.base import BaseModel
 from app import db
 
+try:
+    from gevent.monkey import is_module_patched
+    from gevent.threadpool import ThreadPool
+except ImportError:  # gevent is only installed for the production server
+    ThreadPool = None
+
+# OWASP Argon2id baseline: 46 MiB, 2 iterations, 1 lane
+ARGON2_DEFAULTS = {
+    'ARGON2_TIME_COST': 2,
+    'ARGON2_MEMORY_COST': 46 * 1024,  # KiB
+    'ARGON2_PARALLELISM': 1
+}
+
+_password_hashers = {}
+_dummy_hashes = {}
+_hash_pool = None
+
+def get_password_hasher() -> PasswordHasher:
+    """Argon2id hasher for the configured cost parameters, built once per setting"""
+    config = current_app.config if has_app_context() else {}
+    params = tuple(config.get(key, default) for key, default in ARGON2_DEFAULTS.items())
+    
+    hasher = _password_hashers.get(params)
+    if hasher is None:
+        time_cost, memory_cost, parallelism = params
+        hasher = _password_hashers.setdefault(params, PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            hash_len=32,
+            type=Type.ID
+        ))
+    return hasher
+
+def run_password_hash(func, *args):
+    """
+    Run a password hash or verification without stalling the worker
+    
+    Under gunicorn's gevent worker all requests share one OS thread, so a
+    ~50 ms Argon2 call would block every other request in the process.
+    argon2-cffi releases the GIL, so the call runs on a native thread from
+    a pool capped at the CPU count (each Argon2 call allocates its full
+    memory cost) while only the calling greenlet waits. Without gevent the
+    call runs inline.
+    """
+    global _hash_pool
+    if ThreadPool is None or not is_module_patched('threading'):
+        return func(*args)
+    
+    # Created on first use, so each forked worker gets its own threads
+    if _hash_pool is None:
+        _hash_pool = ThreadPool(os.cpu_count() or 1)
+    return _hash_pool.apply(func, args)
+
 class User(BaseModel):
     """User model for authentication and user management"""
     __tablename__ = 'users'
@@ -35,11 +93,55 @@ class User(BaseModel):
     
     def set_password(self, password):
         """Hash and set the user's password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = run_password_hash(get_password_hasher().hash, password)
     
     def check_password(self, password):
-        """Check if provided password matches the hash"""
-        return check_password_hash(self.password_hash, password)
+        """
+        Check if provided password matches the hash
+        
+        Legacy werkzeug (PBKDF2) hashes and Argon2 hashes with outdated cost
+        parameters are replaced with a current hash on successful login.
+        """
+        hasher = get_password_hasher()
+        if self.password_hash.startswith('$argon2'):
+            try:
+                run_password_hash(hasher.verify, self.password_hash, password)
+            except (VerificationError, InvalidHash):
+                return False
+            needs_rehash = hasher.check_needs_rehash(self.password_hash)
+        else:
+            if not run_password_hash(check_password_hash, self.password_hash, password):
+                return False
+            needs_rehash = True
+        
+        if needs_rehash:
+            try:
+                self.set_password(password)
+                self.save()
+            except Exception:
+                # The password was correct; upgrading the hash can wait
+                db.session.rollback()
+        return True
+    
+    @staticmethod
+    def verify_dummy_password(password):
+        """
+        Run a full Argon2 verification that always fails
+        
+        Used when no user matches a login, so unknown accounts take as long
+        to reject as wrong passwords and cannot be enumerated by timing.
+        """
+        hasher = get_password_hasher()
+        dummy_hash = _dummy_hashes.get(hasher)
+        if dummy_hash is None:
+            dummy_hash = _dummy_hashes.setdefault(
+                hasher, run_password_hash(hasher.hash, 'not-a-real-password')
+            )
+        try:
+            run_password_hash(hasher.verify, dummy_hash, password)
+        except VerificationError:
+            pass
+        return False
     
     def update_last_login(self):
         """Update the last login timestamp"""
@@ -47,4 +149,26 @@ class User(BaseModel):
         self.save()
     
     def __repr__(self):
-        return f'<User {self.username}>'
\ No newline at end of file
+        return f'<User {self.username}>'
+
+# Lowercased text matched by /api/users/search; a trigram GIN index lets
+# Postgres answer LIKE '%term%' on it without scanning every user
+# (literal separators, so queries repeat the indexed expression exactly)
+_SPACE = literal_column("' '")
+USER_SEARCH_TEXT = func.lower(
+    User.username + _SPACE + User.email + _SPACE + func.coalesce(User.full_name, literal_column("''"))
+).label('search_text')
+
+Index(
+    'ix_users_search_trgm',
+    USER_SEARCH_TEXT,
+    postgresql_using='gin',
+    postgresql_ops={'search_text': 'gin_trgm_ops'},
+    postgresql_where=User.is_active
+)
+
+event.listen(
+    User.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
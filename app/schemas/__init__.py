@@ -2,23 +2,36 @@
 Marshmallow schemas for API serialization
 """
 
-from app.schemas.user_schema import UserSchema, UserCreateSchema, UserLoginSchema
-from app.schemas.project_schema import ProjectSchema, ProjectCreateSchema
-from app.schemas.task_schema import TaskSchema, TaskCreateSchema, TaskUpdateSchema
-from app.schemas.comment_schema import CommentSchema, CommentCreateSchema
-from app.schemas.tag_schema import TagSchema, TagCreateSchema
+from app.schemas.user_schema import UserSchema, UserCreateSchema, UserLoginSchema, UserUpdateSchema, ChangePasswordSchema
+from app.schemas.project_schema import (
+    ProjectSchema, ProjectCreateSchema, ProjectUpdateSchema, ProjectMemberSchema, ProjectMemberUpdateSchema
+)
+from app.schemas.task_schema import TaskSchema, TaskCreateSchema, TaskUpdateSchema, TaskStatusUpdateSchema, TaskAssignSchema
+from app.schemas.comment_schema import CommentSchema, CommentCreateSchema, CommentUpdateSchema
+from app.schemas.tag_schema import TagSchema, TagCreateSchema, TagUpdateSchema
+from app.schemas.activity_schema import ActivityLogSchema
 
 __all__ = [
     'UserSchema',
     'UserCreateSchema', 
     'UserLoginSchema',
+    'UserUpdateSchema',
+    'ChangePasswordSchema',
     'ProjectSchema',
     'ProjectCreateSchema',
+    'ProjectUpdateSchema',
+    'ProjectMemberSchema',
+    'ProjectMemberUpdateSchema',
     'TaskSchema',
     'TaskCreateSchema',
     'TaskUpdateSchema',
+    'TaskStatusUpdateSchema',
+    'TaskAssignSchema',
     'CommentSchema',
     'CommentCreateSchema',
+    'CommentUpdateSchema',
     'TagSchema',
     'TagCreateSchema',
+    'TagUpdateSchema',
+    'ActivityLogSchema',
 ]
\ No newline at end of file
@@ -0,0 +1,11 @@
+from marshmallow import Schema, fields
+from app.models import ActivityAction
+
+class ActivityLogSchema(Schema):
+    """Activity log serialization schema"""
+    
+    id = fields.UUID(dump_only=True)
+    action = fields.Enum(ActivityAction, by_value=True)
+    user = fields.Nested('UserSchema', only=('id', 'username', 'full_name'), dump_only=True)
+    details = fields.Raw()
+    created_at = fields.DateTime(dump_only=True)
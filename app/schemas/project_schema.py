@@ -1,6 +1,10 @@
 from marshmallow import Schema, fields, validate
 from app import ma
 from app.models import Project
+from app.schemas.validators import hex_color
+
+_name_length = validate.Length(min=1, max=100)
+_icon_length = validate.Length(max=50)
 
 class ProjectSchema(ma.SQLAlchemyAutoSchema):
     """Project serialization schema"""
@@ -10,39 +14,33 @@ class ProjectSchema(ma.SQLAlchemyAutoSchema):
         load_instance = True
         dump_only_fields = ('id', 'created_at', 'updated_at')
     
-    name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+    name = fields.Str(required=True, validate=_name_length)
     description = fields.Str()
-    color = fields.Str(validate=validate.Regexp(r'^#[0-9A-Fa-f]{6}$'))
-    icon = fields.Str(validate=validate.Length(max=50))
+    color = fields.Str(validate=hex_color)
+    icon = fields.Str(validate=_icon_length)
     owner_id = fields.UUID(dump_only=True)
     is_archived = fields.Bool()
     
     # Nested relationships
     owner = fields.Nested('UserSchema', only=('id', 'username', 'full_name'), dump_only=True)
-    tasks_count = fields.Method('get_tasks_count')
-    members_count = fields.Method('get_members_count')
-    
-    def get_tasks_count(self, obj):
-        return obj.tasks.count()
-    
-    def get_members_count(self, obj):
-        return len(obj.members)
+    tasks_count = fields.Int(dump_only=True)
+    members_count = fields.Int(dump_only=True)
 
 class ProjectCreateSchema(Schema):
     """Schema for project creation"""
     
-    name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+    name = fields.Str(required=True, validate=_name_length)
     description = fields.Str()
-    color = fields.Str(validate=validate.Regexp(r'^#[0-9A-Fa-f]{6}$'))
-    icon = fields.Str(validate=validate.Length(max=50))
+    color = fields.Str(validate=hex_color)
+    icon = fields.Str(validate=_icon_length)
 
 class ProjectUpdateSchema(Schema):
     """Schema for project updates"""
     
-    name = fields.Str(validate=validate.Length(min=1, max=100))
+    name = fields.Str(validate=_name_length)
     description = fields.Str()
-    color = fields.Str(validate=validate.Regexp(r'^#[0-9A-Fa-f]{6}$'))
-    icon = fields.Str(validate=validate.Length(max=50))
+    color = fields.Str(validate=hex_color)
+    icon = fields.Str(validate=_icon_length)
     is_archived = fields.Bool()
 
 class ProjectMemberSchema(Schema):
@@ -1,6 +1,9 @@
 from marshmallow import Schema, fields, validate
 from app import ma
 from app.models import Tag
+from app.schemas.validators import hex_color
+
+_name_length = validate.Length(min=1, max=50)
 
 class TagSchema(ma.SQLAlchemyAutoSchema):
     """Tag serialization schema"""
@@ -10,8 +13,8 @@ class TagSchema(ma.SQLAlchemyAutoSchema):
         load_instance = True
         dump_only_fields = ('id', 'created_at', 'updated_at')
     
-    name = fields.Str(required=True, validate=validate.Length(min=1, max=50))
-    color = fields.Str(validate=validate.Regexp(r'^#[0-9A-Fa-f]{6}$'))
+    name = fields.Str(required=True, validate=_name_length)
+    color = fields.Str(validate=hex_color)
     
     # Relationships
     project = fields.Nested('ProjectSchema', only=('id', 'name'), dump_only=True)
@@ -19,12 +22,12 @@ class TagSchema(ma.SQLAlchemyAutoSchema):
 class TagCreateSchema(Schema):
     """Schema for tag creation"""
     
-    name = fields.Str(required=True, validate=validate.Length(min=1, max=50))
-    color = fields.Str(validate=validate.Regexp(r'^#[0-9A-Fa-f]{6}$'))
+    name = fields.Str(required=True, validate=_name_length)
+    color = fields.Str(validate=hex_color)
     project_id = fields.UUID()  # Optional for global tags
 
 class TagUpdateSchema(Schema):
     """Schema for tag updates"""
     
-    name = fields.Str(validate=validate.Length(min=1, max=50))
-    color = fields.Str(validate=validate.Regexp(r'^#[0-9A-Fa-f]{6}$'))
\ No newline at end of file
+    name = fields.Str(validate=_name_length)
+    color = fields.Str(validate=hex_color)
\ No newline at end of file
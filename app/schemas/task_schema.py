@@ -22,11 +22,8 @@ class TaskSchema(ma.SQLAlchemyAutoSchema):
     project = fields.Nested('ProjectSchema', only=('id', 'name'), dump_only=True)
     assignee = fields.Nested('UserSchema', only=('id', 'username', 'full_name'), dump_only=True)
     creator = fields.Nested('UserSchema', only=('id', 'username', 'full_name'), dump_only=True)
-    comments_count = fields.Method('get_comments_count')
+    comments_count = fields.Int(dump_only=True)
     tags = fields.Nested('TagSchema', many=True, only=('id', 'name', 'color'), dump_only=True)
-    
-    def get_comments_count(self, obj):
-        return obj.comments.count()
 
 class TaskCreateSchema(Schema):
     """Schema for task creation"""
@@ -8,7 +8,10 @@ class UserSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = User
         load_instance = True
-        exclude = ('password_hash',)
+        # Listed explicitly so password_hash, or any column added later, is
+        # never dumped by accident
+        fields = ('id', 'username', 'email', 'full_name', 'avatar_url',
+                  'last_login', 'is_active', 'created_at', 'updated_at')
         dump_only_fields = ('id', 'created_at', 'updated_at', 'last_login')
 
     username = fields.Str(required=True, validate=validate.Length(min=3, max=50))
@@ -24,15 +27,11 @@ class UserCreateSchema(Schema):
     password = fields.Str(required=True, validate=validate.Length(min=6))
     full_name = fields.Str(validate=validate.Length(max=100))
     
+    # Uniqueness is enforced by the users table's unique indexes at insert
     @validates('username')
     def validate_username(self, value):
-        if User.query.filter_by(username=value).first():
-            raise ValidationError('Username already exists')
-    
-    @validates('email')
-    def validate_email(self, value):
-        if User.query.filter_by(email=value).first():
-            raise ValidationError('Email already registered')
+        if '@' in value:
+            raise ValidationError("Username cannot contain '@'")
 
 class UserLoginSchema(Schema):
     """Schema for user login"""
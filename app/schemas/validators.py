@@ -0,0 +1,11 @@
+"""
+Shared field validators
+"""
+
+import re
+from marshmallow import validate
+
+HEX_COLOR_PATTERN = re.compile(r'^#[0-9A-Fa-f]{6}$')
+
+# Validators are stateless, so one instance serves every field that uses it
+hex_color = validate.Regexp(HEX_COLOR_PATTERN)
@@ -4,11 +4,80 @@ Real-time service for broadcasting task and project updates
 
 from app.websocket_config import socketio, broadcast_to_project, broadcast_to_user
 from datetime import datetime
-from typing import Dict, List, Optional
+from threading import Lock
+from typing import Any, Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Task and comment events are coalesced per project and sent as one 'batch'
+# frame BATCH_FLUSH_INTERVAL seconds after the first of them was queued, or
+# as soon as a project has BATCH_MAX_EVENTS waiting
+BATCH_FLUSH_INTERVAL = 0.01
+BATCH_MAX_EVENTS = 64
+
+_pending_events: Dict[Any, List[Dict]] = {}
+_pending_lock = Lock()
+
+def queue_project_event(project_id, event_data: Dict):
+    """
+    Queue an event for the project's next batch frame
+    
+    Args:
+        project_id: Project ID
+        event_data: Event payload; its 'type' names the event for clients
+    """
+    with _pending_lock:
+        events = _pending_events.get(project_id)
+        schedule_flush = events is None
+        if schedule_flush:
+            events = _pending_events[project_id] = []
+        events.append(event_data)
+        full = len(events) >= BATCH_MAX_EVENTS
+        if full:
+            del _pending_events[project_id]
+    
+    if full:
+        _emit_batch(project_id, events)
+    elif schedule_flush:
+        # One delayed flush per batch, so nothing runs while the queue is empty
+        socketio.start_background_task(_flush_later, project_id)
+
+def flush_pending_events():
+    """Send every queued event, one batch frame per project"""
+    with _pending_lock:
+        batches = list(_pending_events.items())
+        _pending_events.clear()
+    
+    for project_id, events in batches:
+        _emit_batch(project_id, events)
+
+def _flush_later(project_id):
+    """Background task sending a project's batch once the interval has passed"""
+    socketio.sleep(BATCH_FLUSH_INTERVAL)
+    with _pending_lock:
+        events = _pending_events.pop(project_id, None)
+    
+    if events:
+        try:
+            _emit_batch(project_id, events)
+        except Exception as e:
+            logger.error(f"Failed to flush batched events: {str(e)}")
+
+def _emit_batch(project_id, events: List[Dict]):
+    """
+    Broadcast queued events to a project room as a single frame
+    
+    Batched events carry no timestamp of their own; the batch's single
+    timestamp, taken at flush time, stands in for all of them.
+    """
+    broadcast_to_project(project_id, 'batch', {
+        'type': 'batch',
+        'project_id': project_id,
+        'events': events,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
 class RealTimeService:
     """
     Service class for managing real-time updates and notifications
@@ -28,12 +97,11 @@ class RealTimeService:
             'type': 'task_created',
             'task': task_data,
             'project_id': project_id,
-            'created_by': creator_id,
-            'timestamp': datetime.utcnow().isoformat()
+            'created_by': creator_id
         }
         
-        broadcast_to_project(project_id, 'task_created', event_data)
-        logger.info(f"Broadcasted task creation for project {project_id}")
+        queue_project_event(project_id, event_data)
+        logger.info("Queued task creation for project %s", project_id)
     
     @staticmethod
     def broadcast_task_updated(task_id: int, updates: Dict, project_id: int, updater_id: int):
@@ -51,12 +119,11 @@ class RealTimeService:
             'task_id': task_id,
             'updates': updates,
             'project_id': project_id,
-            'updated_by': updater_id,
-            'timestamp': datetime.utcnow().isoformat()
+            'updated_by': updater_id
         }
         
-        broadcast_to_project(project_id, 'task_updated', event_data)
-        logger.info(f"Broadcasted task update for task {task_id} in project {project_id}")
+        queue_project_event(project_id, event_data)
+        logger.info("Queued task update for task %s in project %s", task_id, project_id)
     
     @staticmethod
     def broadcast_task_status_change(task_id: int, old_status: str, new_status: str, 
@@ -77,12 +144,11 @@ class RealTimeService:
             'old_status': old_status,
             'new_status': new_status,
             'project_id': project_id,
-            'updated_by': updater_id,
-            'timestamp': datetime.utcnow().isoformat()
+            'updated_by': updater_id
         }
         
-        broadcast_to_project(project_id, 'task_status_changed', event_data)
-        logger.info(f"Broadcasted status change for task {task_id}: {old_status} -> {new_status}")
+        queue_project_event(project_id, event_data)
+        logger.info("Queued status change for task %s: %s -> %s", task_id, old_status, new_status)
     
     @staticmethod
     def broadcast_task_assignment(task_id: int, assignee_id: Optional[int], 
@@ -101,20 +167,19 @@ class RealTimeService:
             'task_id': task_id,
             'assignee_id': assignee_id,
             'project_id': project_id,
-            'assigned_by': assigner_id,
-            'timestamp': datetime.utcnow().isoformat()
+            'assigned_by': assigner_id
         }
         
         # Broadcast to project
-        broadcast_to_project(project_id, 'task_assigned', event_data)
+        queue_project_event(project_id, event_data)
         
         # Send personal notification to assignee
         if assignee_id:
-            personal_data = event_data.copy()
-            personal_data['type'] = 'task_assigned_to_you'
+            # event_data is still waiting in the project batch, so it cannot be reused
+            personal_data = {**event_data, 'type': 'task_assigned_to_you', 'timestamp': datetime.utcnow().isoformat()}
             broadcast_to_user(assignee_id, 'task_assigned_to_you', personal_data)
         
-        logger.info(f"Broadcasted task assignment for task {task_id} to user {assignee_id}")
+        logger.info("Broadcasted task assignment for task %s to user %s", task_id, assignee_id)
     
     @staticmethod
     def broadcast_comment_added(task_id: int, comment_data: Dict, project_id: int, 
@@ -133,12 +198,11 @@ class RealTimeService:
             'task_id': task_id,
             'comment': comment_data,
             'project_id': project_id,
-            'author_id': author_id,
-            'timestamp': datetime.utcnow().isoformat()
+            'author_id': author_id
         }
         
-        broadcast_to_project(project_id, 'comment_added', event_data)
-        logger.info(f"Broadcasted new comment for task {task_id} by user {author_id}")
+        queue_project_event(project_id, event_data)
+        logger.info("Queued new comment for task %s by user %s", task_id, author_id)
     
     @staticmethod
     def broadcast_project_member_added(project_id: int, member_data: Dict, 
@@ -164,11 +228,9 @@ class RealTimeService:
         # Send personal notification to new member
         member_id = member_data.get('user_id')
         if member_id:
-            welcome_data = event_data.copy()
-            welcome_data['type'] = 'added_to_project'
-            broadcast_to_user(member_id, 'added_to_project', welcome_data)
+            broadcast_to_user(member_id, 'added_to_project', {**event_data, 'type': 'added_to_project'})
         
-        logger.info(f"Broadcasted member addition for project {project_id}")
+        logger.info("Broadcasted member addition for project %s", project_id)
     
     @staticmethod
     def broadcast_due_date_reminder(task_id: int, task_data: Dict, 
@@ -196,7 +258,7 @@ class RealTimeService:
         # Also broadcast to project (optional)
         broadcast_to_project(project_id, 'due_date_reminder', event_data)
         
-        logger.info(f"Sent due date reminder for task {task_id} to user {assignee_id}")
+        logger.info("Sent due date reminder for task %s to user %s", task_id, assignee_id)
     
     @staticmethod
     def get_online_users(project_id: int) -> List[int]:
@@ -232,4 +294,4 @@ class RealTimeService:
         }
         
         broadcast_to_project(project_id, 'user_presence', event_data)
-        logger.info(f"Broadcasted presence update for user {user_id}: {'online' if is_online else 'offline'}")
\ No newline at end of file
+        logger.info("Broadcasted presence update for user %s: %s", user_id, 'online' if is_online else 'offline')
\ No newline at end of file
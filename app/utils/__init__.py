@@ -2,13 +2,14 @@
 Utility functions for the Task Manager API
 """
 
-from app.utils.responses import success_response, error_response, paginated_response
+from app.utils.responses import success_response, error_response, no_content_response, paginated_response
 from app.utils.decorators import jwt_required_with_user, permission_required
 from app.utils.helpers import get_or_404, validate_json
 
 __all__ = [
     'success_response',
     'error_response', 
+    'no_content_response',
     'paginated_response',
     'jwt_required_with_user',
     'permission_required',
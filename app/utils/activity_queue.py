@@ -0,0 +1,142 @@
+"""
+Deferred activity logging through a Redis list
+
+With ACTIVITY_LOG_ASYNC enabled, ActivityLog.log_activity queues entries on
+the session instead of adding rows. Once the request's transaction commits
+they are pushed to Redis, and the `flask activity-worker` command writes
+them in batches. Entries carry their own id, so replays are harmless.
+"""
+
+import time
+import uuid
+from datetime import datetime
+import click
+import orjson
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from app import db
+from app.utils.redis_client import get_redis
+
+ACTIVITY_QUEUE_KEY = 'activity:queue'
+_PENDING_KEY = 'pending_activities'
+
+def queue_activity(values: dict) -> bool:
+    """
+    Queue an activity log entry to be written after the current commit
+    
+    Args:
+        values: ActivityLog column values, including id and created_at
+    
+    Returns:
+        False if async logging is disabled, in which case the caller
+        should write the row itself
+    """
+    if not current_app.config.get('ACTIVITY_LOG_ASYNC') or get_redis() is None:
+        return False
+    
+    db.session.info.setdefault(_PENDING_KEY, []).append(values)
+    return True
+
+def _push_pending(session):
+    """Hand entries from a committed transaction to the worker"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    
+    try:
+        get_redis().rpush(ACTIVITY_QUEUE_KEY, *(_encode_activity(values) for values in pending))
+    except Exception as e:
+        # Never drop history: fall back to writing the rows directly
+        current_app.logger.warning(f"Failed to queue activity logs: {e}")
+        _insert_activities(pending)
+
+def _discard_pending(session):
+    """Drop entries whose transaction was rolled back"""
+    session.info.pop(_PENDING_KEY, None)
+
+def register_activity_queue():
+    """Attach the commit and rollback hooks to the Flask-SQLAlchemy session"""
+    if not event.contains(db.session, 'after_commit', _push_pending):
+        event.listen(db.session, 'after_commit', _push_pending)
+        event.listen(db.session, 'after_rollback', _discard_pending)
+
+def _insert_activities(entries: list):
+    """Insert activity rows in one statement, skipping ids already written"""
+    from app.models import ActivityLog, Task
+    
+    with db.engine.begin() as connection:
+        # Tasks deleted since the entry was queued: keep the entry, drop the link,
+        # as deleting a task does for rows already written
+        task_ids = {entry['task_id'] for entry in entries if entry['task_id'] is not None}
+        if task_ids:
+            existing = set(connection.scalars(select(Task.id).where(Task.id.in_(task_ids))))
+            for entry in entries:
+                if entry['task_id'] not in existing:
+                    entry['task_id'] = None
+        
+        connection.execute(
+            insert(ActivityLog).on_conflict_do_nothing(index_elements=['id']),
+            entries
+        )
+
+def _encode_activity(values: dict) -> bytes:
+    """Serialize ActivityLog column values for the queue"""
+    return orjson.dumps({**values, 'action': values['action'].value}, default=str)
+
+def _decode_activity(payload: bytes) -> dict:
+    """Rebuild ActivityLog column values from a queued JSON entry"""
+    from app.models import ActivityAction
+    
+    values = orjson.loads(payload)
+    for key in ('id', 'user_id', 'project_id', 'task_id'):
+        if values[key] is not None:
+            values[key] = uuid.UUID(values[key])
+    values['action'] = ActivityAction(values['action'])
+    values['created_at'] = datetime.fromisoformat(values['created_at'])
+    values['updated_at'] = values['created_at']
+    return values
+
+def drain_activity_queue(batch_size: int = 100) -> int:
+    """
+    Write one batch of queued activity logs
+    
+    Entries are removed from the queue only after their batch commits, so a
+    crash replays the batch rather than losing it. Assumes a single worker.
+    
+    Args:
+        batch_size: Maximum number of entries to write
+    
+    Returns:
+        Number of entries processed
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+    
+    payloads = client.lrange(ACTIVITY_QUEUE_KEY, 0, batch_size - 1)
+    if not payloads:
+        return 0
+    
+    _insert_activities([_decode_activity(payload) for payload in payloads])
+    client.ltrim(ACTIVITY_QUEUE_KEY, len(payloads), -1)
+    return len(payloads)
+
+@click.command('activity-worker')
+@click.option('--batch-size', default=100, show_default=True, help='Entries written per INSERT.')
+@click.option('--once', is_flag=True, help='Drain the queue and exit.')
+@with_appcontext
+def activity_worker_command(batch_size, once):
+    """Write queued activity logs to the database."""
+    if get_redis() is None:
+        raise click.ClickException('REDIS_URL is not configured')
+    
+    while True:
+        written = drain_activity_queue(batch_size)
+        if written:
+            click.echo(f'Wrote {written} activity log entries')
+        elif once:
+            break
+        else:
+            time.sleep(1)
@@ -0,0 +1,89 @@
+"""
+Short-lived Redis cache for read-heavy GET endpoints
+"""
+
+import time
+from functools import wraps
+from typing import Callable, Optional
+import orjson
+from flask import current_app, request
+from app.utils.redis_client import get_redis
+
+CACHE_KEY_PREFIX = 'cache:'
+
+def cached(namespace: str, ttl: int = 15, access: Optional[Callable[..., bool]] = None):
+    """
+    Cache successful JSON responses per user in Redis
+    
+    Entries live in one Redis hash per namespace, so a read is a single
+    HGET and invalidate_cache() drops a whole namespace with one DEL.
+    Must be applied below jwt_required_with_user. Without REDIS_URL the
+    view runs uncached.
+    
+    Args:
+        namespace: Namespace template formatted with the view's URL
+            arguments, e.g. 'task:{task_id}'
+        ttl: Seconds a cached response stays valid
+        access: Called as access(current_user, **view_kwargs) before the
+            cache is read; when it returns False the view runs uncached
+            and answers with its own error, so a cached body is never
+            served to a user who has since lost access
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(current_user, *args, **kwargs):
+            client = get_redis()
+            if client is None or (access is not None and not access(current_user, **kwargs)):
+                return f(current_user=current_user, *args, **kwargs)
+            
+            cache_key = CACHE_KEY_PREFIX + namespace.format(**kwargs).lower()
+            field = f"{current_user.id}|{request.full_path}"
+            
+            try:
+                entry = client.hget(cache_key, field)
+                if entry is not None:
+                    entry = orjson.loads(entry)
+                    if time.time() - entry['stored_at'] < ttl:
+                        return current_app.response_class(
+                            entry['body'], status=200, mimetype='application/json'
+                        )
+            except Exception as e:
+                current_app.logger.warning(f"Response cache read failed: {e}")
+            
+            rv = f(current_user=current_user, *args, **kwargs)
+            response = current_app.make_response(rv)
+            
+            if response.status_code == 200:
+                entry = orjson.dumps({
+                    'stored_at': time.time(),
+                    'body': response.get_data(as_text=True)
+                })
+                try:
+                    pipe = client.pipeline(transaction=False)
+                    pipe.hset(cache_key, field, entry)
+                    # Expire the hash ttl seconds after its first entry;
+                    # refreshing it on every miss would keep it forever
+                    pipe.expire(cache_key, ttl, nx=True)
+                    pipe.execute()
+                except Exception as e:
+                    current_app.logger.warning(f"Response cache write failed: {e}")
+            
+            return response
+        return decorated_function
+    return decorator
+
+def invalidate_cache(*namespaces: str) -> None:
+    """
+    Drop every cached response in one or more namespaces
+    
+    Args:
+        *namespaces: Formatted namespaces, e.g. f'task:{task.id}'
+    """
+    client = get_redis()
+    if client is None or not namespaces:
+        return
+    
+    try:
+        client.delete(*(CACHE_KEY_PREFIX + namespace.lower() for namespace in namespaces))
+    except Exception as e:
+        current_app.logger.warning(f"Response cache invalidation failed: {e}")
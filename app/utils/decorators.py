@@ -2,22 +2,43 @@
 Custom decorators for API endpoints
 """
 
+import hashlib
 from functools import wraps
-from flask import request
+from flask import request, abort, g, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import User, Project, ProjectMember, MemberRole
+from sqlalchemy.orm import joinedload
+from app.models import Project, MemberRole
 from app.utils.responses import error_response
-from app.utils.helpers import get_or_404
+from app.utils.permissions import OWNER_ROLE, load_project_with_access
+from app.utils.user_cache import get_cached_user
+
+# Permission hierarchy for project members, keyed by MemberRole
+ROLE_LEVELS = {
+    MemberRole.VIEWER: 1,
+    MemberRole.MEMBER: 2,
+    MemberRole.ADMIN: 3
+}
 
 def jwt_required_with_user(f):
     """
     JWT required decorator that also injects current user
+    
+    The user is resolved through the in-process user cache, so most
+    authenticated requests skip the users table entirely, and is kept on
+    flask.g so nested decorated calls in the same request reuse it.
     """
     @wraps(f)
     @jwt_required()
     def decorated_function(*args, **kwargs):
         current_user_id = get_jwt_identity()
-        current_user = get_or_404(User, current_user_id)
+        if g.get('current_user_id') == current_user_id:
+            current_user = g.current_user
+        else:
+            current_user = get_cached_user(current_user_id)
+            if not current_user:
+                abort(404, description="User not found")
+            g.current_user_id = current_user_id
+            g.current_user = current_user
         return f(current_user=current_user, *args, **kwargs)
     return decorated_function
 
@@ -28,41 +49,55 @@ def permission_required(permission_level: str = 'member'):
     Args:
         permission_level: Required permission ('viewer', 'member', 'admin')
     """
+    # Resolved once per decorated view, not per request
+    required_level = {role.value: level for role, level in ROLE_LEVELS.items()}.get(permission_level, 2)
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(current_user, project_id, *args, **kwargs):
-            project = get_or_404(Project, project_id)
+            # Project and role come from one query, or none if already checked
+            # in this request
+            project, role = load_project_with_access(
+                project_id, current_user.id, load_options=[joinedload(Project.owner)]
+            )
             
             # Project owner has all permissions
-            if project.owner_id == current_user.id:
-                return f(current_user=current_user, project=project, *args, **kwargs)
+            if role == OWNER_ROLE:
+                return f(current_user=current_user, project=project, project_id=project_id, *args, **kwargs)
             
             # Check project membership
-            membership = ProjectMember.query.filter_by(
-                project_id=project_id,
-                user_id=current_user.id
-            ).first()
-            
-            if not membership:
+            if role is None:
                 return error_response("Access denied: Not a project member", status_code=403)
             
             # Check permission level
-            role_hierarchy = {
-                'viewer': 1,
-                'member': 2, 
-                'admin': 3
-            }
-            
-            required_level = role_hierarchy.get(permission_level, 2)
-            user_level = role_hierarchy.get(membership.role.value, 1)
-            
-            if user_level < required_level:
+            if ROLE_LEVELS[role] < required_level:
                 return error_response(f"Access denied: {permission_level} permission required", status_code=403)
             
-            return f(current_user=current_user, project=project, *args, **kwargs)
+            return f(current_user=current_user, project=project, project_id=project_id, *args, **kwargs)
         return decorated_function
     return decorator
 
+def conditional_get(f):
+    """
+    Answer repeated GETs of an unchanged resource with 304 Not Modified
+    
+    Successful responses get a weak ETag hashed from their body, and a
+    request whose If-None-Match matches it gets an empty 304 instead. The
+    tag covers everything in the payload, including counts and owner fields
+    that a max(updated_at) validator would miss. Responses are per user, so
+    shared caches must not store them and clients must revalidate.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = make_response(f(*args, **kwargs))
+        if response.status_code != 200:
+            return response
+        
+        response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest(), weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response.make_conditional(request)
+    return decorated_function
+
 def rate_limit(requests_per_minute: int = 60):
     """
     Simple rate limiting decorator (placeholder for future implementation)
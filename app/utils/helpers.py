@@ -2,13 +2,32 @@
 Helper utility functions
 """
 
-from flask import request, abort
-from sqlalchemy.orm import Query
-from typing import Type, Any, Dict, Optional
+import base64
+import json
+import uuid
+from datetime import datetime
+from functools import wraps
+from flask import request, abort, current_app, g
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Query, raiseload
+from typing import Type, Any, Dict, List, Optional, Sequence
 from app import db
+from app.models import Task, TaskStatus, TaskPriority
 from app.utils.responses import error_response, validation_error_response
 
-def get_or_404(model: Type[db.Model], id_value: Any, message: str = None):
+# Query parameters get_request_filters passes through to apply_task_filters
+REQUEST_FILTER_KEYS = ('created_after', 'created_before', 'search', 'status', 'priority', 'assignee_id')
+
+# How get_request_filters converts each filter to its column's type
+REQUEST_FILTER_PARSERS = {
+    'created_after': datetime.fromisoformat,
+    'created_before': datetime.fromisoformat,
+    'status': TaskStatus,
+    'priority': TaskPriority,
+    'assignee_id': uuid.UUID
+}
+
+def get_or_404(model: Type[db.Model], id_value: Any, message: str = None, load_options: Optional[List] = None):
     """
     Get model instance by ID or return 404 error
     
@@ -16,6 +35,7 @@ def get_or_404(model: Type[db.Model], id_value: Any, message: str = None):
         model: SQLAlchemy model class
         id_value: ID value to search for
         message: Custom error message
+        load_options: Loader options (e.g. joinedload) applied to the lookup
         
     Returns:
         Model instance
@@ -23,7 +43,8 @@ def get_or_404(model: Type[db.Model], id_value: Any, message: str = None):
     Raises:
         404 error if not found
     """
-    instance = model.query.get(id_value)
+    # Session.get returns identity-map hits without a round-trip
+    instance = db.session.get(model, id_value, options=load_options)
     if not instance:
         error_msg = message or f"{model.__name__} not found"
         abort(404, description=error_msg)
@@ -39,25 +60,46 @@ def validate_json(schema_class):
     Returns:
         Decorator function
     """
+    # Schemas hold no per-request state, so one instance serves every call
+    schema = schema_class()
+    
     def decorator(f):
+        @wraps(f)
         def decorated_function(*args, **kwargs):
             if not request.is_json:
                 return error_response("Content-Type must be application/json", status_code=400)
             
-            schema = schema_class()
             try:
-                validated_data = schema.load(request.json)
+                validated_data = schema.load(request.get_json())
                 return f(validated_data=validated_data, *args, **kwargs)
             except Exception as e:
                 if hasattr(e, 'messages'):
                     return validation_error_response(e.messages)
                 return error_response("Invalid JSON data", status_code=400)
         
-        decorated_function.__name__ = f.__name__
         return decorated_function
     return decorator
 
-def paginate_query(query: Query, page: int = None, per_page: int = None) -> Dict:
+def strict_load_options(*options) -> List:
+    """
+    Loader options for API read paths
+    
+    Under TESTING any lazy load that would emit SQL raises (identity map hits
+    are still allowed), so a serializer that starts lazy loading fails loudly
+    instead of quietly adding a query per row.
+    
+    Args:
+        *options: Loader options (e.g. joinedload) the read path relies on
+        
+    Returns:
+        List of loader options
+    """
+    options = list(options)
+    if current_app.config.get('TESTING'):
+        options.append(raiseload('*', sql_only=True))
+    return options
+
+def paginate_query(query: Query, page: int = None, per_page: int = None, load_options: Optional[List] = None) -> Dict:
     """
     Paginate a SQLAlchemy query
     
@@ -65,10 +107,13 @@ def paginate_query(query: Query, page: int = None, per_page: int = None) -> Dict
         query: SQLAlchemy query object
         page: Page number (from request if None)
         per_page: Items per page (from request if None)
+        load_options: Loader options (e.g. joinedload) applied to the page query
         
     Returns:
         Dictionary with pagination info and items
     """
+    if load_options:
+        query = query.options(*load_options)
     if page is None:
         page = request.args.get('page', 1, type=int)
     if per_page is None:
@@ -77,8 +122,35 @@ def paginate_query(query: Query, page: int = None, per_page: int = None) -> Dict
     # Limit per_page to prevent abuse
     per_page = min(per_page, 100)
     
-    total = query.count()
-    items = query.offset((page - 1) * per_page).limit(per_page).all()
+    offset = (page - 1) * per_page
+    
+    # The window is evaluated before DISTINCT, so it would count duplicates;
+    # such queries keep the separate COUNT. GROUP BY is fine: the window
+    # then counts groups.
+    if query._distinct:
+        return {
+            'items': query.offset(offset).limit(per_page).all(),
+            'page': page,
+            'per_page': per_page,
+            'total': query.order_by(None).count()
+        }
+    
+    # Fetch the page and the total row count in one round-trip
+    rows = query.add_columns(
+        func.count().over().label('total_count')
+    ).offset(offset).limit(per_page).all()
+    
+    if rows:
+        total = rows[0].total_count
+        # Unwrap single-entity rows; column queries keep their tuples
+        if len(query.column_descriptions) == 1:
+            items = [row[0] for row in rows]
+        else:
+            items = [row[:-1] for row in rows]
+    else:
+        # Past the last page the window has no rows to report a total on
+        total = query.count() if page > 1 else 0
+        items = []
     
     return {
         'items': items,
@@ -87,38 +159,154 @@ def paginate_query(query: Query, page: int = None, per_page: int = None) -> Dict
         'total': total
     }
 
-def get_request_filters() -> Dict[str, Any]:
+def paginate_query_countless(query: Query, page: int = None, per_page: int = None) -> Dict:
     """
-    Extract common filters from request args
+    Paginate a SQLAlchemy query without counting the total
     
+    Fetches one extra row to report has_next instead of total/pages, for
+    listings where a COUNT over the whole result would dominate.
+    
+    Args:
+        query: SQLAlchemy query object
+        page: Page number (from request if None)
+        per_page: Items per page (from request if None)
+        
     Returns:
-        Dictionary of filters
+        Dictionary with pagination info and items
+    """
+    if page is None:
+        page = request.args.get('page', 1, type=int)
+    if per_page is None:
+        per_page = request.args.get('per_page', 20, type=int)
+    
+    # Limit per_page to prevent abuse
+    per_page = min(per_page, 100)
+    
+    rows = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+    
+    return {
+        'items': rows[:per_page],
+        'page': page,
+        'per_page': per_page,
+        'has_next': len(rows) > per_page
+    }
+
+def encode_cursor(item: Any, columns: Sequence) -> str:
+    """
+    Encode an item's sort key as an opaque keyset pagination cursor
+    
+    Args:
+        item: Last item of the current page
+        columns: Sort key columns
+        
+    Returns:
+        URL-safe cursor string
     """
-    filters = {}
+    values = [getattr(item, column.key) for column in columns]
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+def decode_cursor(cursor: str, columns: Sequence) -> List:
+    """
+    Decode a cursor produced by encode_cursor
     
-    # Date filters
-    if request.args.get('created_after'):
-        filters['created_after'] = request.args.get('created_after')
-    if request.args.get('created_before'):
-        filters['created_before'] = request.args.get('created_before')
+    Args:
+        cursor: Cursor string from the request
+        columns: Sort key columns the cursor was encoded with
+        
+    Returns:
+        Sort key values
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        
+        decoded = []
+        for column, value in zip(columns, values):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is uuid.UUID:
+                value = uuid.UUID(value)
+            decoded.append(value)
+        return decoded
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+def paginate_keyset(query: Query, columns: Sequence, descending: bool = False, per_page: int = None) -> Dict:
+    """
+    Paginate a query by its sort key instead of OFFSET
     
-    # Search filter
-    if request.args.get('search'):
-        filters['search'] = request.args.get('search')
+    Each page costs the same regardless of depth and no total is counted.
+    The columns must form a unique key, e.g. (updated_at, id).
     
-    # Status filter
-    if request.args.get('status'):
-        filters['status'] = request.args.get('status')
+    Args:
+        query: SQLAlchemy query object (its ordering is replaced)
+        columns: Sort key columns
+        descending: Sort newest/largest first
+        per_page: Items per page (from request if None)
+        
+    Returns:
+        Dictionary with items, per_page and next_cursor (None on the last page)
+        
+    Raises:
+        ValueError: If the request's cursor is malformed
+    """
+    if per_page is None:
+        per_page = request.args.get('per_page', 20, type=int)
+    per_page = min(per_page, 100)
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        key, bound = tuple_(*columns), tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < bound if descending else key > bound)
+    
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    # Fetch one extra row to learn whether another page follows
+    rows = query.order_by(None).order_by(*ordering).limit(per_page + 1).all()
     
-    # Priority filter
-    if request.args.get('priority'):
-        filters['priority'] = request.args.get('priority')
+    items = rows[:per_page]
+    next_cursor = encode_cursor(items[-1], columns) if len(rows) > per_page else None
+    
+    return {
+        'items': items,
+        'per_page': per_page,
+        'next_cursor': next_cursor
+    }
+
+def get_request_filters() -> Dict[str, Any]:
+    """
+    Extract common filters from request args
     
-    # Assignee filter
-    if request.args.get('assignee_id'):
-        filters['assignee_id'] = request.args.get('assignee_id')
+    Each key is read once and converted to the type its column expects,
+    and the result is memoized on flask.g for the rest of the request.
     
-    return filters
+    Returns:
+        Dictionary of filters
+        
+    Raises:
+        400 error if a filter value is malformed
+    """
+    filters = g.get('request_filters')
+    if filters is None:
+        args = request.args
+        filters = {}
+        for key in REQUEST_FILTER_KEYS:
+            value = args.get(key)
+            if not value:
+                continue
+            parser = REQUEST_FILTER_PARSERS.get(key)
+            if parser is not None:
+                try:
+                    value = parser(value)
+                except ValueError:
+                    abort(400, description=f"Invalid {key} filter: {value}")
+            filters[key] = value
+        g.request_filters = filters
+    return dict(filters)
 
 def apply_task_filters(query: Query, filters: Dict[str, Any]) -> Query:
     """
@@ -126,13 +314,12 @@ def apply_task_filters(query: Query, filters: Dict[str, Any]) -> Query:
     
     Args:
         query: Base query
-        filters: Dictionary of filters
+        filters: Dictionary of filters, as parsed by get_request_filters
         
     Returns:
         Filtered query
     """
-    from app.models import Task, TaskStatus, TaskPriority
-    
+    # Substring match, served by the trigram index on title and description
     if filters.get('search'):
         search_term = f"%{filters['search']}%"
         query = query.filter(
@@ -141,10 +328,10 @@ def apply_task_filters(query: Query, filters: Dict[str, Any]) -> Query:
         )
     
     if filters.get('status'):
-        query = query.filter(Task.status == TaskStatus(filters['status']))
+        query = query.filter(Task.status == filters['status'])
     
     if filters.get('priority'):
-        query = query.filter(Task.priority == TaskPriority(filters['priority']))
+        query = query.filter(Task.priority == filters['priority'])
     
     if filters.get('assignee_id'):
         query = query.filter(Task.assignee_id == filters['assignee_id'])
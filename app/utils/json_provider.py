@@ -0,0 +1,63 @@
+"""
+orjson-backed JSON provider for Flask
+"""
+
+import decimal
+import json
+from typing import Any
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+def _default(obj: Any) -> Any:
+    """Serialize the few types orjson does not handle natively"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider that encodes and decodes with orjson
+    
+    Used by jsonify (and therefore every success/error response) as well as
+    request.get_json. datetime, UUID, enum and dataclass values are encoded
+    natively; naive datetimes are treated as UTC.
+    """
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode()
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response; dumps() would decode
+        # them to str only for Werkzeug to encode them again
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        return self._app.response_class(body, mimetype='application/json')
+    
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        # orjson has no hooks; the session serializer passes object_hook to
+        # restore tagged values such as the (category, message) flash tuples
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+class OrjsonModule:
+    """
+    Stand-in for the json module, for libraries that take one
+    
+    python-socketio encodes packets with json.dumps(obj, separators=...)
+    and expects a str back; extra keyword arguments are ignored since
+    orjson output is already compact.
+    """
+    
+    @staticmethod
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode()
+    
+    @staticmethod
+    def loads(s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
@@ -0,0 +1,242 @@
+"""
+Project permission lookups
+"""
+
+from typing import Any, List, Optional, Tuple, Union
+from flask import abort, current_app, g
+from sqlalchemy import String, and_, case, cast, event, literal, select
+from sqlalchemy.orm import contains_eager, object_session
+from sqlalchemy.orm.util import identity_key
+from app import db
+from app.models import Project, ProjectMember, MemberRole, Task
+from app.utils.redis_client import get_redis
+
+OWNER_ROLE = 'owner'
+
+# Roles are also cached in Redis, one hash per project keyed by user ID.
+# Membership and project changes drop the hash after commit; the TTL bounds
+# how long a lookup racing such a change can keep a stale role.
+ROLE_CACHE_PREFIX = 'project_roles:'
+ROLE_CACHE_TTL = 60
+_STALE_ROLES_KEY = 'stale_project_roles'
+_MISS = object()
+
+# What get_project_role returns: OWNER_ROLE, a MemberRole, or None
+ProjectRole = Optional[Union[str, MemberRole]]
+
+def get_project_role(user_id: Any, project_id: Any) -> ProjectRole:
+    """
+    Resolve a user's role in a project with at most one query
+    
+    Owner and membership are checked together in a single SELECT. If the
+    project is already in the session and owned by the user, or the role is
+    cached in Redis, no query runs. Results are memoized on flask.g, so
+    repeated checks for the same user and project within one request are
+    free.
+    
+    Args:
+        user_id: User ID
+        project_id: Project ID
+        
+    Returns:
+        OWNER_ROLE, the user's MemberRole, or None if the user has no access
+        or the project does not exist. Compare member roles by identity
+        (role is MemberRole.VIEWER).
+    """
+    cache = g.setdefault('project_roles', {})
+    key = (str(user_id), str(project_id))
+    if key not in cache:
+        cache[key] = _query_project_role(user_id, project_id)
+    return cache[key]
+
+def _query_project_role(user_id: Any, project_id: Any) -> ProjectRole:
+    """Look up a user's project role, bypassing the request cache"""
+    project = db.session.identity_map.get(identity_key(Project, project_id))
+    if project is not None and project.owner_id == user_id:
+        return OWNER_ROLE
+    
+    role = _read_cached_role(user_id, project_id)
+    if role is not _MISS:
+        return role
+    
+    role = db.session.execute(
+        select(_role_column(user_id)).select_from(Project).outerjoin(
+            ProjectMember,
+            _membership_clause(user_id)
+        ).where(Project.id == project_id)
+    ).scalar()
+    
+    _store_cached_role(user_id, project_id, role)
+    return _normalize_role(role)
+
+def load_task_with_access(task_id: Any, user_id: Any) -> Tuple[Task, ProjectRole]:
+    """
+    Load a task, its project, and the user's role in that project in one query
+    
+    The role is stored in the same request cache as get_project_role, so
+    later permission checks for this project do not query again.
+    
+    Args:
+        task_id: Task ID
+        user_id: ID of the user requesting access
+        
+    Returns:
+        Tuple of (task, role) with task.project already populated; role is
+        as returned by get_project_role
+        
+    Raises:
+        404 error if the task does not exist
+    """
+    row = db.session.query(Task, _role_column(user_id)).join(Task.project).outerjoin(
+        ProjectMember,
+        _membership_clause(user_id)
+    ).options(contains_eager(Task.project)).filter(Task.id == task_id).first()
+    
+    if row is None:
+        abort(404, description="Task not found")
+    
+    task, role = row[0], _normalize_role(row[1])
+    _store_cached_role(user_id, task.project_id, row[1])
+    g.setdefault('project_roles', {})[(str(user_id), str(task.project_id))] = role
+    return task, role
+
+def load_project_with_access(project_id: Any, user_id: Any, load_options: Optional[List] = None) -> Tuple[Project, ProjectRole]:
+    """
+    Load a project and the user's role in it in one query
+    
+    Within a request, a project already in the session whose role is
+    cached is returned without querying at all.
+    
+    Args:
+        project_id: Project ID
+        user_id: ID of the user requesting access
+        load_options: Loader options (e.g. joinedload) applied to the project
+        
+    Returns:
+        Tuple of (project, role); role is as returned by get_project_role
+        
+    Raises:
+        404 error if the project does not exist
+    """
+    cache = g.setdefault('project_roles', {})
+    key = (str(user_id), str(project_id))
+    project = db.session.identity_map.get(identity_key(Project, project_id))
+    if project is not None and key in cache:
+        return project, cache[key]
+    
+    row = db.session.query(Project, _role_column(user_id)).outerjoin(
+        ProjectMember,
+        _membership_clause(user_id)
+    ).options(*(load_options or [])).filter(Project.id == project_id).first()
+    
+    if row is None:
+        abort(404, description="Project not found")
+    
+    project, role = row[0], _normalize_role(row[1])
+    _store_cached_role(user_id, project.id, row[1])
+    cache[(str(user_id), str(project.id))] = role
+    return project, role
+
+def _role_column(user_id: Any):
+    """Role expression: 'owner' for the project owner, else the member role"""
+    return case(
+        (Project.owner_id == user_id, literal(OWNER_ROLE)),
+        else_=cast(ProjectMember.role, String)
+    )
+
+def _membership_clause(user_id: Any):
+    """Join condition matching the user's membership row for a project"""
+    return and_(
+        ProjectMember.project_id == Project.id,
+        ProjectMember.user_id == user_id
+    )
+
+def _normalize_role(role: Optional[str]) -> ProjectRole:
+    """Map a stored role (enum name) to its MemberRole"""
+    if role is None:
+        return None
+    if role == OWNER_ROLE:
+        return OWNER_ROLE
+    # Member roles are stored by enum name
+    return MemberRole[role]
+
+def _read_cached_role(user_id: Any, project_id: Any):
+    """Role from the Redis cache, or _MISS if absent or Redis is unavailable"""
+    client = get_redis()
+    if client is None:
+        return _MISS
+    
+    try:
+        value = client.hget(f"{ROLE_CACHE_PREFIX}{project_id}", str(user_id))
+    except Exception as e:
+        current_app.logger.warning(f"Project role cache read failed: {e}")
+        return _MISS
+    
+    if value is None:
+        return _MISS
+    # An empty string records "no access"
+    return _normalize_role(value.decode() or None)
+
+def _store_cached_role(user_id: Any, project_id: Any, role: Optional[str]):
+    """Cache a stored role (enum name, OWNER_ROLE or None) in Redis"""
+    client = get_redis()
+    if client is None:
+        return
+    
+    key = f"{ROLE_CACHE_PREFIX}{project_id}"
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(key, str(user_id), role or '')
+        # Only the first write sets the deadline, so later misses cannot
+        # keep an entry cached past ROLE_CACHE_TTL
+        pipe.expire(key, ROLE_CACHE_TTL, nx=True)
+        pipe.execute()
+    except Exception as e:
+        current_app.logger.warning(f"Project role cache write failed: {e}")
+
+def mark_project_roles_stale(project_id: Any) -> None:
+    """
+    Drop a project's cached roles once the current transaction commits
+    
+    The mapper listeners below cover ORM flushes; call this after bulk or
+    Core statements on project_members, which bypass them.
+    """
+    db.session.info.setdefault(_STALE_ROLES_KEY, set()).add(project_id)
+
+@event.listens_for(ProjectMember, 'after_insert')
+@event.listens_for(ProjectMember, 'after_update')
+@event.listens_for(ProjectMember, 'after_delete')
+def _member_changed(mapper, connection, target):
+    """Mark a project's cached roles stale when a membership changes"""
+    object_session(target).info.setdefault(_STALE_ROLES_KEY, set()).add(target.project_id)
+
+@event.listens_for(Project, 'after_update')
+@event.listens_for(Project, 'after_delete')
+def _project_changed(mapper, connection, target):
+    """Mark a project's cached roles stale when it changes (e.g. its owner)"""
+    object_session(target).info.setdefault(_STALE_ROLES_KEY, set()).add(target.id)
+
+def _drop_stale_roles(session):
+    """Drop cached roles of projects changed by the committed transaction"""
+    project_ids = session.info.pop(_STALE_ROLES_KEY, None)
+    if not project_ids:
+        return
+    
+    client = get_redis()
+    if client is None:
+        return
+    
+    try:
+        client.delete(*(f"{ROLE_CACHE_PREFIX}{project_id}" for project_id in project_ids))
+    except Exception as e:
+        current_app.logger.warning(f"Project role cache invalidation failed: {e}")
+
+def _discard_stale_roles(session):
+    """Nothing was written, so the cached roles are still valid"""
+    session.info.pop(_STALE_ROLES_KEY, None)
+
+def register_role_cache():
+    """Attach the role cache invalidation hooks to the Flask-SQLAlchemy session"""
+    if not event.contains(db.session, 'after_commit', _drop_stale_roles):
+        event.listen(db.session, 'after_commit', _drop_stale_roles)
+        event.listen(db.session, 'after_rollback', _discard_stale_roles)
@@ -0,0 +1,27 @@
+"""
+Shared Redis connection
+"""
+
+import redis
+from typing import Optional
+from flask import current_app
+
+_clients = {}
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Get a Redis client for the configured REDIS_URL
+    
+    Clients are created once per URL and share a connection pool.
+    
+    Returns:
+        Redis client, or None if REDIS_URL is not set
+    """
+    url = current_app.config.get('REDIS_URL')
+    if not url:
+        return None
+    
+    client = _clients.get(url)
+    if client is None:
+        client = _clients.setdefault(url, redis.Redis.from_url(url))
+    return client
@@ -24,6 +24,15 @@ def success_response(data: Any = None, message: str = "Success", status_code: in
     }
     return jsonify(response), status_code
 
+def no_content_response() -> tuple:
+    """
+    Create an empty 204 response for actions that return no data
+    
+    Returns:
+        Tuple of (body, status_code)
+    """
+    return '', 204
+
 def error_response(message: str = "An error occurred", errors: List[str] = None, status_code: int = 400) -> tuple:
     """
     Create a standardized error response
@@ -0,0 +1,93 @@
+"""
+JWT revocation in Redis, fronted by a Bloom filter when RedisBloom is loaded
+"""
+
+import redis
+from datetime import datetime, timezone
+from flask import current_app
+from app.utils.redis_client import get_redis
+
+BLOOM_KEY = 'jwt:revoked'
+REVOKED_KEY_PREFIX = 'jwt:revoked:'
+
+# Whether each Redis client has the RedisBloom module, probed on first use
+_bloom_support = {}
+
+def _has_bloom(client: redis.Redis) -> bool:
+    """
+    Check once per client whether the BF.* commands are available
+    
+    Plain Redis (e.g. a managed instance without modules) answers them with
+    "unknown command"; the blocklist then uses the per-token keys alone.
+    Connection errors propagate so that an outage is not remembered as
+    missing support.
+    """
+    supported = _bloom_support.get(client)
+    if supported is None:
+        try:
+            client.execute_command('BF.EXISTS', BLOOM_KEY, '')
+            supported = True
+        except redis.ResponseError:
+            current_app.logger.info("RedisBloom not available; token blocklist uses plain keys")
+            supported = False
+        _bloom_support[client] = supported
+    return supported
+
+def revoke_token(jwt_payload: dict) -> bool:
+    """
+    Add a token to the blocklist until it expires
+    
+    Args:
+        jwt_payload: Decoded JWT payload
+        
+    Returns:
+        True if the token was recorded, False if Redis is unavailable
+    """
+    client = get_redis()
+    if client is None:
+        return False
+    
+    jti = jwt_payload['jti']
+    ttl = int(jwt_payload['exp'] - datetime.now(timezone.utc).timestamp())
+    if ttl <= 0:
+        return True
+    
+    try:
+        pipe = client.pipeline(transaction=False)
+        if _has_bloom(client):
+            pipe.execute_command('BF.ADD', BLOOM_KEY, jti)
+        pipe.set(f"{REVOKED_KEY_PREFIX}{jti}", 1, ex=ttl)
+        pipe.execute()
+    except Exception as e:
+        current_app.logger.warning(f"Failed to revoke token {jti}: {e}")
+        return False
+    return True
+
+def is_token_revoked(jwt_header: dict, jwt_payload: dict) -> bool:
+    """
+    Check whether a token has been revoked
+    
+    With RedisBloom, BF.EXISTS answers most checks with a definite "no"
+    and only possible hits are confirmed against the per-token key;
+    without it the per-token key is checked directly. Fails open if Redis
+    is down.
+    
+    Args:
+        jwt_header: Decoded JWT header
+        jwt_payload: Decoded JWT payload
+        
+    Returns:
+        True if the token is revoked
+    """
+    client = get_redis()
+    if client is None:
+        return False
+    
+    jti = jwt_payload['jti']
+    try:
+        if _has_bloom(client) and not client.execute_command('BF.EXISTS', BLOOM_KEY, jti):
+            return False
+        return bool(client.exists(f"{REVOKED_KEY_PREFIX}{jti}"))
+    except Exception as e:
+        current_app.logger.warning(f"Token blocklist check failed: {e}")
+        return False
@@ -0,0 +1,36 @@
+"""
+Grouping several model saves into one commit
+"""
+
+from contextlib import contextmanager
+from app import db
+
+_DEPTH_KEY = 'transaction_depth'
+
+def in_transaction() -> bool:
+    """Whether the current session is inside a transaction() block"""
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+@contextmanager
+def transaction():
+    """
+    Commit everything saved inside the block once, on exit
+    
+    BaseModel.save() and .delete() only flush while a block is open, so
+    chained model helpers (e.g. mark_complete followed by an activity log)
+    share a single commit. Blocks may be nested; only the outermost one
+    commits. Any exception rolls the whole block back and is re-raised.
+    """
+    info = db.session.info
+    depth = info.get(_DEPTH_KEY, 0)
+    info[_DEPTH_KEY] = depth + 1
+    try:
+        yield db.session
+        if depth == 0:
+            db.session.commit()
+    except Exception:
+        if depth == 0:
+            db.session.rollback()
+        raise
+    finally:
+        info[_DEPTH_KEY] = depth
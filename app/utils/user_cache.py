@@ -0,0 +1,163 @@
+"""
+In-process cache for JWT identity to User lookups, and a Redis cache of
+serialized users
+"""
+
+import uuid
+from datetime import datetime
+from threading import Lock
+from typing import Any, Iterable, List, Optional
+from cachetools import TTLCache
+import orjson
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from app import db
+from app.models import User
+from app.schemas import UserSchema
+from app.utils.cache import CACHE_KEY_PREFIX
+from app.utils.redis_client import get_redis
+
+# Kept short so a deactivated or edited user is never served stale for long
+USER_CACHE_TTL = 15
+
+# Serialized users are keyed by updated_at, so this only bounds memory use
+USER_DUMP_TTL = 3600
+
+# Keys UserSchema dumps; every one is a plain column
+_USER_DUMP_FIELDS = tuple(UserSchema().dump_fields)
+
+_user_cache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
+_user_cache_lock = Lock()
+
+def get_cached_user(user_id: Any) -> Optional[User]:
+    """
+    Get user by ID, skipping the database on a cache hit
+    
+    Args:
+        user_id: User ID (typically the JWT identity)
+        
+    Returns:
+        User instance attached to the current session, or None if not found
+    """
+    key = str(user_id)
+    with _user_cache_lock:
+        snapshot = _user_cache.get(key)
+    
+    if snapshot is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        
+        with _user_cache_lock:
+            _user_cache[key] = _snapshot(user)
+        return user
+    
+    # Copy the detached snapshot into this session without emitting a SELECT
+    return db.session.merge(snapshot, load=False)
+
+def invalidate_user(user_id: Any):
+    """
+    Drop a user from the cache
+    
+    Args:
+        user_id: User ID
+    """
+    with _user_cache_lock:
+        _user_cache.pop(str(user_id), None)
+
+def dump_user(user: User) -> dict:
+    """
+    Serialize a user as UserSchema does, reusing a cached dump when unchanged
+    
+    Args:
+        user: User instance
+        
+    Returns:
+        Serialized user
+    """
+    return dump_users([user])[0]
+
+def dump_users(users: Iterable[User]) -> List[dict]:
+    """
+    Serialize users as UserSchema does, reusing cached dumps when unchanged
+    
+    Dumps are stored under the user's id and updated_at, which every write
+    to the row bumps, so an edited user simply misses. All keys are read
+    with one MGET and misses are written back in one pipeline. Without
+    REDIS_URL every user is dumped.
+    
+    Args:
+        users: User instances
+        
+    Returns:
+        Serialized users, in the same order
+    """
+    users = list(users)
+    client = get_redis()
+    if client is None or not users:
+        return [_serialize_user(user) for user in users]
+    
+    keys = [_dump_key(user) for user in users]
+    try:
+        entries = client.mget(keys)
+    except Exception as e:
+        current_app.logger.warning(f"User dump cache read failed: {e}")
+        entries = [None] * len(users)
+    
+    data = []
+    misses = {}
+    for user, key, entry in zip(users, keys, entries):
+        if entry is None:
+            user_data = _serialize_user(user)
+            misses[key] = orjson.dumps(user_data)
+        else:
+            user_data = orjson.loads(entry)
+        data.append(user_data)
+    
+    if misses:
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, payload in misses.items():
+                pipe.set(key, payload, ex=USER_DUMP_TTL)
+            pipe.execute()
+        except Exception as e:
+            current_app.logger.warning(f"User dump cache write failed: {e}")
+    
+    return data
+
+def _serialize_user(user: User) -> dict:
+    """
+    Produce UserSchema().dump(user) without going through marshmallow
+    
+    UserSchema only dumps column values, so the output is the loaded
+    columns with datetimes and UUIDs formatted as marshmallow does. This
+    skips marshmallow's per-field dispatch on every profile and search hit.
+    """
+    values = user.to_dict()
+    data = {}
+    for name in _USER_DUMP_FIELDS:
+        value = values[name]
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        data[name] = value
+    return data
+
+def _dump_key(user: User) -> str:
+    """Cache key for a user's serialized form at its current version"""
+    return f"{CACHE_KEY_PREFIX}user:{user.id}:{user.updated_at.timestamp()}"
+
+def _snapshot(user: User) -> User:
+    """Build a detached copy of a loaded user that sessions can merge"""
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    snapshot = User(**values)
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_on_change(mapper, connection, target):
+    """Evict users whose row changed (last login, password, profile, is_active)"""
+    invalidate_user(target.id)
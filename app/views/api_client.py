@@ -0,0 +1,66 @@
+"""
+In-process calls from the HTML views to the JSON API
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+def api_request(method, path, headers=None, params=None, json=None):
+    """
+    Dispatch a request to this app's API without leaving the process
+    
+    The views used to call their own API over HTTP at request.url_root,
+    which opened a socket per call and needed a second free worker to
+    answer it; with a single worker the page deadlocked on itself. This
+    runs the same routing, JWT checks and serialization as a real request.
+    
+    Args:
+        method: HTTP method
+        path: API path, e.g. '/api/projects'
+        headers: Request headers, typically the Authorization header
+        params: Query string parameters
+        json: JSON request body
+    
+    Returns:
+        Response with status_code and get_json()
+    """
+    client = current_app.test_client(use_cookies=False)
+    # A fresh app context keeps the API request from sharing the view's g
+    with current_app.app_context():
+        return client.open(path, method=method, headers=headers, query_string=params, json=json)
+
+def api_get(path, **kwargs):
+    """GET an API path in-process"""
+    return api_request('GET', path, **kwargs)
+
+def api_post(path, **kwargs):
+    """POST to an API path in-process"""
+    return api_request('POST', path, **kwargs)
+
+def api_put(path, **kwargs):
+    """PUT to an API path in-process"""
+    return api_request('PUT', path, **kwargs)
+
+def api_get_many(*paths, headers=None):
+    """
+    GET several API paths concurrently
+    
+    Each call runs in its own worker with its own app context and database
+    session, so a page's independent reads wait for the slowest one rather
+    than for all of them in turn. Under gunicorn's gevent worker the pool's
+    threads are greenlets and psycopg2 yields while waiting on PostgreSQL.
+    
+    Args:
+        *paths: API paths to fetch
+        headers: Request headers shared by every call
+    
+    Returns:
+        List of responses, in the order of paths
+    """
+    app = current_app._get_current_object()
+    
+    def fetch(path):
+        return app.test_client(use_cookies=False).get(path, headers=headers)
+    
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        return list(pool.map(fetch, paths))
@@ -5,8 +5,7 @@ Authentication Views - Login, Register, Logout
 from flask import Blueprint, render_template, redirect, url_for, flash, request, session
 from app.models import User
 from app import db
-import requests
-import json
+from app.views.api_client import api_post
 
 auth_views_bp = Blueprint('auth_views', __name__, url_prefix='/auth')
 
@@ -18,14 +17,14 @@ def login():
         password = request.form.get('password')
         
         # Call backend API for authentication
-        api_url = request.url_root + 'api/auth/login'
-        response = requests.post(api_url, json={
+        api_url = '/api/auth/login'
+        response = api_post(api_url, json={
             'email': email,
             'password': password
         })
         
         if response.status_code == 200:
-            data = response.json()
+            data = response.get_json()
             # Store tokens in session
             session['access_token'] = data['data']['access_token']
             session['refresh_token'] = data['data']['refresh_token']
@@ -47,8 +46,8 @@ def register():
         full_name = request.form.get('full_name')
         
         # Call backend API for registration
-        api_url = request.url_root + 'api/auth/register'
-        response = requests.post(api_url, json={
+        api_url = '/api/auth/register'
+        response = api_post(api_url, json={
             'username': username,
             'email': email,
             'password': password,
@@ -56,7 +55,7 @@ def register():
         })
         
         if response.status_code == 201:
-            data = response.json()
+            data = response.get_json()
             # Auto-login after registration
             session['access_token'] = data['data']['access_token']
             session['refresh_token'] = data['data']['refresh_token']
@@ -64,7 +63,7 @@ def register():
             flash('Registration successful! Welcome!', 'success')
             return redirect(url_for('dashboard_views.dashboard'))
         else:
-            error_msg = response.json().get('error', 'Registration failed')
+            error_msg = response.get_json().get('error', 'Registration failed')
             flash(error_msg, 'danger')
     
     return render_template('auth/register.html')
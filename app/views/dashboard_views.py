@@ -2,8 +2,8 @@
 Dashboard Views - Main user dashboard
 """
 
-from flask import Blueprint, render_template, redirect, url_for, session, request
-import requests
+from flask import Blueprint, render_template, redirect, url_for, session
+from app.views.api_client import api_get_many
 from functools import wraps
 
 dashboard_views_bp = Blueprint('dashboard_views', __name__)
@@ -25,37 +25,36 @@ def dashboard():
     # Get user's projects
     headers = {'Authorization': f"Bearer {session['access_token']}"}
     
-    # Fetch projects
-    projects_response = requests.get(
-        request.url_root + 'api/projects',
-        headers=headers
-    )
-    
-    # Fetch recent tasks
-    tasks_response = requests.get(
-        request.url_root + 'api/tasks?per_page=10',
+    # Fetch projects, recent tasks and task counters (aggregated in SQL) concurrently
+    projects_response, tasks_response, stats_response = api_get_many(
+        '/api/projects',
+        '/api/tasks?per_page=5',
+        '/api/tasks/stats',
         headers=headers
     )
     
     projects = []
     tasks = []
+    stats = {
+        'total_projects': 0,
+        'total_tasks': 0,
+        'pending_tasks': 0,
+        'completed_tasks': 0
+    }
     
     if projects_response.status_code == 200:
-        projects = projects_response.json()['data']['projects']
+        projects_data = projects_response.get_json()['data']
+        projects = projects_data['projects']
+        stats['total_projects'] = projects_data['pagination']['total']
     
     if tasks_response.status_code == 200:
-        tasks = tasks_response.json()['data']['tasks']
+        tasks = tasks_response.get_json()['data']['tasks']
     
-    # Calculate statistics
-    stats = {
-        'total_projects': len(projects),
-        'total_tasks': len(tasks),
-        'pending_tasks': len([t for t in tasks if t['status'] == 'todo']),
-        'completed_tasks': len([t for t in tasks if t['status'] == 'done'])
-    }
+    if stats_response.status_code == 200:
+        stats.update(stats_response.get_json()['data'])
     
     return render_template('dashboard.html', 
                          user=session.get('user'),
                          projects=projects,
-                         recent_tasks=tasks[:5],
+                         recent_tasks=tasks,
                          stats=stats)
\ No newline at end of file
@@ -3,7 +3,7 @@ Project Views - Project management interface
 """
 
 from flask import Blueprint, render_template, redirect, url_for, session, request, flash
-import requests
+from app.views.api_client import api_get, api_get_many, api_post, api_put
 from functools import wraps
 
 project_views_bp = Blueprint('project_views', __name__, url_prefix='/projects')
@@ -23,14 +23,14 @@ def projects_list():
     """List all projects"""
     headers = {'Authorization': f"Bearer {session['access_token']}"}
     
-    response = requests.get(
-        request.url_root + 'api/projects',
+    response = api_get(
+        '/api/projects',
         headers=headers
     )
     
     projects = []
     if response.status_code == 200:
-        projects = response.json()['data']['projects']
+        projects = response.get_json()['data']['projects']
     
     return render_template('projects/list.html', projects=projects)
 
@@ -47,8 +47,8 @@ def new_project():
             'color': request.form.get('color', '#3498db')
         }
         
-        response = requests.post(
-            request.url_root + 'api/projects',
+        response = api_post(
+            '/api/projects',
             headers=headers,
             json=data
         )
@@ -67,21 +67,11 @@ def project_detail(project_id):
     """View project details"""
     headers = {'Authorization': f"Bearer {session['access_token']}"}
     
-    # Get project details
-    project_response = requests.get(
-        f"{request.url_root}api/projects/{project_id}",
-        headers=headers
-    )
-    
-    # Get project tasks
-    tasks_response = requests.get(
-        f"{request.url_root}api/tasks?project_id={project_id}",
-        headers=headers
-    )
-    
-    # Get project members
-    members_response = requests.get(
-        f"{request.url_root}api/projects/{project_id}/members",
+    # Get project details, tasks and members concurrently
+    project_response, tasks_response, members_response = api_get_many(
+        f"/api/projects/{project_id}",
+        f"/api/tasks?project_id={project_id}",
+        f"/api/projects/{project_id}/members",
         headers=headers
     )
     
@@ -89,9 +79,9 @@ def project_detail(project_id):
         flash('Project not found', 'danger')
         return redirect(url_for('project_views.projects_list'))
     
-    project = project_response.json()['data']
-    tasks = tasks_response.json()['data']['tasks'] if tasks_response.status_code == 200 else []
-    members = members_response.json()['data']['members'] if members_response.status_code == 200 else []
+    project = project_response.get_json()['data']
+    tasks = tasks_response.get_json()['data']['tasks'] if tasks_response.status_code == 200 else []
+    members = members_response.get_json()['data']['members'] if members_response.status_code == 200 else []
     
     return render_template('projects/detail.html', 
                          project=project,
@@ -111,8 +101,8 @@ def edit_project(project_id):
             'color': request.form.get('color')
         }
         
-        response = requests.put(
-            f"{request.url_root}api/projects/{project_id}",
+        response = api_put(
+            f"/api/projects/{project_id}",
             headers=headers,
             json=data
         )
@@ -124,8 +114,8 @@ def edit_project(project_id):
             flash('Failed to update project', 'danger')
     
     # Get current project data
-    response = requests.get(
-        f"{request.url_root}api/projects/{project_id}",
+    response = api_get(
+        f"/api/projects/{project_id}",
         headers=headers
     )
     
@@ -133,5 +123,5 @@ def edit_project(project_id):
         flash('Project not found', 'danger')
         return redirect(url_for('project_views.projects_list'))
     
-    project = response.json()['data']
+    project = response.get_json()['data']
     return render_template('projects/edit.html', project=project)
\ No newline at end of file
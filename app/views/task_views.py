@@ -2,12 +2,28 @@
 Task Views - Task management interface
 """
 
-from flask import Blueprint, render_template, redirect, url_for, session, request, flash, jsonify
-import requests
+from urllib.parse import urlencode
+from flask import (Blueprint, Response, current_app, render_template, redirect, url_for, session, request,
+                   flash, get_flashed_messages, jsonify, stream_with_context)
+from app.views.api_client import api_get, api_get_many, api_post, api_put
 from functools import wraps
 
 task_views_bp = Blueprint('task_views', __name__, url_prefix='/tasks')
 
+# Template events per chunk when streaming the task list
+TEMPLATE_STREAM_BUFFER = 20
+
+# Form fields posted to the tasks API; empty ones are left out
+TASK_FORM_FIELDS = ('title', 'description', 'project_id', 'assignee_id', 'status',
+                    'priority', 'due_date', 'estimated_hours')
+TASK_EDIT_FORM_FIELDS = ('title', 'description', 'status', 'priority', 'due_date',
+                         'estimated_hours')
+
+def _form_data(fields):
+    """Non-empty values of the given fields from the submitted form"""
+    form = request.form
+    return {field: form[field] for field in fields if form.get(field)}
+
 def login_required(f):
     """Decorator to require login for views"""
     @wraps(f)
@@ -36,27 +52,33 @@ def tasks_list():
     if project_id:
         params['project_id'] = project_id
     
-    response = requests.get(
-        request.url_root + 'api/tasks',
-        headers=headers,
-        params=params
+    # Fetch tasks and the projects for the filter dropdown concurrently
+    response, projects_response = api_get_many(
+        f"/api/tasks?{urlencode(params)}",
+        '/api/projects',
+        headers=headers
     )
     
     tasks = []
     if response.status_code == 200:
-        tasks = response.json()['data']['tasks']
-    
-    # Get projects for filter dropdown
-    projects_response = requests.get(
-        request.url_root + 'api/projects',
-        headers=headers
-    )
-    projects = projects_response.json()['data']['projects'] if projects_response.status_code == 200 else []
-    
-    return render_template('tasks/list.html', 
-                         tasks=tasks,
-                         projects=projects,
-                         current_filters=params)
+        tasks = response.get_json()['data']['tasks']
+    
+    projects = projects_response.get_json()['data']['projects'] if projects_response.status_code == 200 else []
+    
+    # Stream the page so the browser starts on the layout while task rows
+    # render, a few template blocks per write. Flashed messages are popped
+    # first: the session cookie is written before the body, so popping them
+    # mid-stream would not stick
+    get_flashed_messages(with_categories=True)
+    context = {
+        'tasks': tasks,
+        'projects': projects,
+        'current_filters': params
+    }
+    current_app.update_template_context(context)
+    stream = current_app.jinja_env.get_template('tasks/list.html').stream(context)
+    stream.enable_buffering(TEMPLATE_STREAM_BUFFER)
+    return Response(stream_with_context(stream), mimetype='text/html')
 
 @task_views_bp.route('/new', methods=['GET', 'POST'])
 @login_required
@@ -65,39 +87,29 @@ def new_task():
     headers = {'Authorization': f"Bearer {session['access_token']}"}
     
     if request.method == 'POST':
-        data = {
-            'title': request.form.get('title'),
-            'description': request.form.get('description'),
-            'project_id': request.form.get('project_id'),
-            'assignee_id': request.form.get('assignee_id'),
-            'status': request.form.get('status', 'todo'),
-            'priority': request.form.get('priority', 'medium'),
-            'due_date': request.form.get('due_date'),
-            'estimated_hours': request.form.get('estimated_hours')
-        }
+        data = _form_data(TASK_FORM_FIELDS)
+        data.setdefault('status', 'todo')
+        data.setdefault('priority', 'medium')
         
-        # Remove empty values
-        data = {k: v for k, v in data.items() if v}
-        
-        response = requests.post(
-            request.url_root + 'api/tasks',
+        response = api_post(
+            '/api/tasks',
             headers=headers,
             json=data
         )
         
         if response.status_code == 201:
             flash('Task created successfully!', 'success')
-            task_data = response.json()['data']
+            task_data = response.get_json()['data']
             return redirect(url_for('task_views.task_detail', task_id=task_data['id']))
         else:
             flash('Failed to create task', 'danger')
     
     # Get projects for dropdown
-    projects_response = requests.get(
-        request.url_root + 'api/projects',
+    projects_response = api_get(
+        '/api/projects',
         headers=headers
     )
-    projects = projects_response.json()['data']['projects'] if projects_response.status_code == 200 else []
+    projects = projects_response.get_json()['data']['projects'] if projects_response.status_code == 200 else []
     
     return render_template('tasks/new.html', projects=projects)
 
@@ -107,9 +119,11 @@ def task_detail(task_id):
     """View task details"""
     headers = {'Authorization': f"Bearer {session['access_token']}"}
     
-    # Get task details
-    task_response = requests.get(
-        f"{request.url_root}api/tasks/{task_id}",
+    # Get task details, comments and history concurrently
+    task_response, comments_response, history_response = api_get_many(
+        f"/api/tasks/{task_id}",
+        f"/api/comments/tasks/{task_id}/comments",
+        f"/api/tasks/{task_id}/history",
         headers=headers
     )
     
@@ -117,21 +131,9 @@ def task_detail(task_id):
         flash('Task not found', 'danger')
         return redirect(url_for('task_views.tasks_list'))
     
-    task = task_response.json()['data']
-    
-    # Get task comments
-    comments_response = requests.get(
-        f"{request.url_root}api/comments/tasks/{task_id}/comments",
-        headers=headers
-    )
-    comments = comments_response.json()['data']['comments'] if comments_response.status_code == 200 else []
-    
-    # Get task history
-    history_response = requests.get(
-        f"{request.url_root}api/tasks/{task_id}/history",
-        headers=headers
-    )
-    history = history_response.json()['data']['activities'] if history_response.status_code == 200 else []
+    task = task_response.get_json()['data']
+    comments = comments_response.get_json()['data']['comments'] if comments_response.status_code == 200 else []
+    history = history_response.get_json()['data']['activities'] if history_response.status_code == 200 else []
     
     return render_template('tasks/detail.html', 
                          task=task,
@@ -145,20 +147,10 @@ def edit_task(task_id):
     headers = {'Authorization': f"Bearer {session['access_token']}"}
     
     if request.method == 'POST':
-        data = {
-            'title': request.form.get('title'),
-            'description': request.form.get('description'),
-            'status': request.form.get('status'),
-            'priority': request.form.get('priority'),
-            'due_date': request.form.get('due_date'),
-            'estimated_hours': request.form.get('estimated_hours')
-        }
-        
-        # Remove empty values
-        data = {k: v for k, v in data.items() if v}
+        data = _form_data(TASK_EDIT_FORM_FIELDS)
         
-        response = requests.put(
-            f"{request.url_root}api/tasks/{task_id}",
+        response = api_put(
+            f"/api/tasks/{task_id}",
             headers=headers,
             json=data
         )
@@ -170,8 +162,8 @@ def edit_task(task_id):
             flash('Failed to update task', 'danger')
     
     # Get current task data
-    response = requests.get(
-        f"{request.url_root}api/tasks/{task_id}",
+    response = api_get(
+        f"/api/tasks/{task_id}",
         headers=headers
     )
     
@@ -179,7 +171,7 @@ def edit_task(task_id):
         flash('Task not found', 'danger')
         return redirect(url_for('task_views.tasks_list'))
     
-    task = response.json()['data']
+    task = response.get_json()['data']
     return render_template('tasks/edit.html', task=task)
 
 @task_views_bp.route('/<task_id>/status', methods=['POST'])
@@ -190,8 +182,8 @@ def update_task_status(task_id):
     
     data = {'status': request.json.get('status')}
     
-    response = requests.put(
-        f"{request.url_root}api/tasks/{task_id}/status",
+    response = api_put(
+        f"/api/tasks/{task_id}/status",
         headers=headers,
         json=data
     )
@@ -209,8 +201,8 @@ def add_comment(task_id):
     
     data = {'content': request.form.get('content')}
     
-    response = requests.post(
-        f"{request.url_root}api/comments/tasks/{task_id}/comments",
+    response = api_post(
+        f"/api/comments/tasks/{task_id}/comments",
         headers=headers,
         json=data
     )
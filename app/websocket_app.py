@@ -22,16 +22,16 @@ def create_websocket_app(app=None):
         app = Flask(__name__)
         app.config['SECRET_KEY'] = 'your-secret-key-here'
     
-    # Initialize WebSocket
-    socketio = init_websocket(app)
-    
     # Add WebSocket configuration
     app.config.update({
         'WEBSOCKET_ENABLED': True,
         'WEBSOCKET_CORS_ORIGINS': '*',
-        'WEBSOCKET_ASYNC_MODE': 'threading'
+        'WEBSOCKET_ASYNC_MODE': 'gevent'
     })
     
+    # Initialize WebSocket
+    socketio = init_websocket(app)
+    
     # Register WebSocket blueprint or routes if needed
     # (Event handlers are automatically registered via import)
     
@@ -2,21 +2,31 @@
 WebSocket configuration and setup for real-time task management
 """
 
+import hashlib
+import time
+from threading import Lock
+from cachetools import TTLCache
 from flask_socketio import SocketIO
 from flask import request, session
 from flask_jwt_extended import decode_token, JWTManager
+from app.utils.json_provider import OrjsonModule
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize SocketIO
+# Identities of recently verified tokens, keyed by a digest of the token;
+# entries are also dropped once the token itself expires
+_decoded_tokens = TTLCache(maxsize=10_000, ttl=300)
+_decoded_tokens_lock = Lock()
+
+# Initialize SocketIO; packets are encoded with orjson, as API responses are.
+# The async mode, message queue and packet logging are chosen per app in
+# init_websocket
 socketio = SocketIO(
     cors_allowed_origins="*",
-    logger=True,
-    engineio_logger=True,
-    async_mode='threading'
+    json=OrjsonModule
 )
 
 def init_websocket(app):
@@ -26,7 +36,23 @@ def init_websocket(app):
     Args:
         app: Flask application instance
     """
-    socketio.init_app(app, cors_allowed_origins="*")
+    # msgpack frames are binary and smaller than JSON; every client must
+    # then connect with the matching parser. Under gevent every socket is a
+    # greenlet on the worker's hub rather than an OS thread, and with Redis
+    # configured, emits from any worker process reach every connected client
+    socketio.init_app(
+        app,
+        cors_allowed_origins="*",
+        async_mode=app.config.get('WEBSOCKET_ASYNC_MODE', 'gevent'),
+        message_queue=app.config.get('REDIS_URL'),
+        serializer=app.config.get('WEBSOCKET_SERIALIZER', 'default'),
+        # Keepalive is Engine.IO's own ping/pong, no application event
+        ping_interval=app.config.get('WEBSOCKET_PING_INTERVAL', 25),
+        ping_timeout=app.config.get('WEBSOCKET_PING_TIMEOUT', 60),
+        # Logs every packet and heartbeat; for debugging only
+        logger=app.config.get('WEBSOCKET_LOGGING', False),
+        engineio_logger=app.config.get('WEBSOCKET_LOGGING', False)
+    )
     return socketio
 
 def authenticate_socket_user():
@@ -46,9 +72,7 @@ def authenticate_socket_user():
             logger.warning("No token provided for WebSocket authentication")
             return None
             
-        # Decode JWT token to get user info
-        decoded_token = decode_token(token)
-        user_id = decoded_token.get('sub')
+        user_id = _token_identity(token)
         
         if user_id:
             return {
@@ -56,10 +80,20 @@ def authenticate_socket_user():
                 'token': token
             }
     except Exception as e:
-        logger.error(f"WebSocket authentication error: {str(e)}")
+        logger.error("WebSocket authentication error: %s", e)
         
     return None
 
+def room_name_for(room_type, entity_id):
+    """
+    Socket.IO room name for a user, project or task
+    
+    Args:
+        room_type: Type of room ('user', 'project', 'task')
+        entity_id: ID of the user, project or task
+    """
+    return f"{room_type}_{entity_id}"
+
 def join_user_room(user_id, room_type='user'):
     """
     Join user to their personal room for targeted notifications
@@ -70,9 +104,9 @@ def join_user_room(user_id, room_type='user'):
     """
     from flask_socketio import join_room
     
-    room_name = f"{room_type}_{user_id}"
+    room_name = room_name_for(room_type, user_id)
     join_room(room_name)
-    logger.info(f"User {user_id} joined room: {room_name}")
+    logger.info("User %s joined room: %s", user_id, room_name)
     return room_name
 
 def leave_user_room(user_id, room_type='user'):
@@ -85,9 +119,9 @@ def leave_user_room(user_id, room_type='user'):
     """
     from flask_socketio import leave_room
     
-    room_name = f"{room_type}_{user_id}"
+    room_name = room_name_for(room_type, user_id)
     leave_room(room_name)
-    logger.info(f"User {user_id} left room: {room_name}")
+    logger.info("User %s left room: %s", user_id, room_name)
 
 def broadcast_to_project(project_id, event_name, data):
     """
@@ -98,9 +132,9 @@ def broadcast_to_project(project_id, event_name, data):
         event_name: Name of the event
         data: Event data
     """
-    room_name = f"project_{project_id}"
+    room_name = room_name_for('project', project_id)
     socketio.emit(event_name, data, room=room_name)
-    logger.info(f"Broadcasted {event_name} to project room: {room_name}")
+    logger.debug("Broadcasted %s to project room: %s", event_name, room_name)
 
 def broadcast_to_user(user_id, event_name, data):
     """
@@ -111,6 +145,37 @@ def broadcast_to_user(user_id, event_name, data):
         event_name: Name of the event
         data: Event data
     """
-    room_name = f"user_{user_id}"
+    room_name = room_name_for('user', user_id)
     socketio.emit(event_name, data, room=room_name)
-    logger.info(f"Sent {event_name} to user room: {room_name}")
\ No newline at end of file
+    logger.debug("Sent %s to user room: %s", event_name, room_name)
+
+def _token_identity(token):
+    """
+    Get a token's subject, verifying its signature only on a cache miss
+    
+    Reconnecting clients present the same token again, so its identity is
+    remembered until the token expires (at most five minutes). Only a digest
+    of the token is kept.
+    
+    Args:
+        token: Encoded JWT
+        
+    Returns:
+        The token's 'sub' claim
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    
+    with _decoded_tokens_lock:
+        entry = _decoded_tokens.get(key)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+    
+    # Decode JWT token to get user info
+    decoded_token = decode_token(token)
+    user_id = decoded_token.get('sub')
+    
+    if user_id:
+        with _decoded_tokens_lock:
+            _decoded_tokens[key] = (user_id, decoded_token.get('exp', now + 300))
+    return user_id
@@ -2,16 +2,31 @@
 WebSocket event handlers for real-time task management
 """
 
+import time
+from threading import Lock
 from flask_socketio import emit, join_room, leave_room, disconnect
 from flask import request, session
-from app.websocket_config import socketio, authenticate_socket_user, join_user_room, leave_user_room
+from app.websocket_config import socketio, authenticate_socket_user, join_user_room, leave_user_room, room_name_for
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Store connected users
+# User ID of each authenticated connection, keyed by socket session ID
 connected_users = {}
 
+# Seconds between sweeps for connections whose disconnect event was missed
+CONNECTION_PRUNE_INTERVAL = 60
+_pruner_started = False
+
+# Typing indicators are rebroadcast at most this often while a user keeps
+# typing, and cleared after this long without a keystroke (seconds)
+TYPING_REFRESH_INTERVAL = 2.0
+TYPING_IDLE_TIMEOUT = 1.0
+
+# (sid, task_id) -> [is_typing, last broadcast, last keystroke]
+_typing_state = {}
+_typing_lock = Lock()
+
 @socketio.on('connect')
 def handle_connect():
     """
@@ -24,8 +39,13 @@ def handle_connect():
         disconnect()
         return False
     
+    global _pruner_started
+    
     user_id = user_data['user_id']
-    connected_users[request.sid] = user_data
+    connected_users[request.sid] = user_id
+    if not _pruner_started:
+        _pruner_started = True
+        socketio.start_background_task(_prune_connections)
     
     # Join user to their personal room
     join_user_room(user_id)
@@ -36,24 +56,66 @@ def handle_connect():
         'user_id': user_id
     })
     
-    logger.info(f"User {user_id} connected with session {request.sid}")
+    logger.info("User %s connected with session %s", user_id, request.sid)
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """
     Handle client WebSocket disconnection
     """
-    if request.sid in connected_users:
-        user_data = connected_users[request.sid]
-        user_id = user_data['user_id']
-        
+    # Remove from connected users
+    user_id = _forget_connection(request.sid)
+    if user_id is not None:
         # Leave user room
         leave_user_room(user_id)
         
-        # Remove from connected users
-        del connected_users[request.sid]
-        
-        logger.info(f"User {user_id} disconnected")
+        logger.info("User %s disconnected", user_id)
+
+def _forget_connection(sid):
+    """
+    Drop a connection's state
+    
+    Pending typing indicators are cleared by their watchers once their
+    state is gone.
+    
+    Returns:
+        The connection's user ID, or None if it was not tracked
+    """
+    user_id = connected_users.pop(sid, None)
+    with _typing_lock:
+        for key in [key for key in _typing_state if key[0] == sid]:
+            del _typing_state[key]
+    return user_id
+
+def _prune_connections():
+    """Background task dropping connections the server no longer has"""
+    while True:
+        socketio.sleep(CONNECTION_PRUNE_INTERVAL)
+        manager = socketio.server.manager
+        for sid in list(connected_users):
+            if not manager.is_connected(sid, '/'):
+                _forget_connection(sid)
+
+def _event_fields(data, required, optional=()):
+    """
+    Read an event payload's fields, checking the required ones
+    
+    Args:
+        data: Payload sent by the client
+        required: Fields that must be present and non-empty
+        optional: Fields that may be missing (read as None)
+    
+    Returns:
+        Tuple of the required then the optional values, or None if the
+        payload is not an object or a required field is missing
+    """
+    if not isinstance(data, dict):
+        return None
+    
+    values = tuple(data.get(key) for key in required)
+    if not all(values):
+        return None
+    return values + tuple(data.get(key) for key in optional)
 
 @socketio.on('join_project')
 def handle_join_project(data):
@@ -63,7 +125,8 @@ def handle_join_project(data):
     Args:
         data: Dictionary containing project_id
     """
-    if request.sid not in connected_users:
+    user_id = connected_users.get(request.sid)
+    if user_id is None:
         emit('error', {'message': 'Not authenticated'})
         return
     
@@ -72,11 +135,8 @@ def handle_join_project(data):
         emit('error', {'message': 'Project ID required'})
         return
     
-    user_data = connected_users[request.sid]
-    user_id = user_data['user_id']
-    
     # Join project room
-    room_name = f"project_{project_id}"
+    room_name = room_name_for('project', project_id)
     join_room(room_name)
     
     emit('joined_project', {
@@ -84,7 +144,7 @@ def handle_join_project(data):
         'room': room_name
     })
     
-    logger.info(f"User {user_id} joined project room: {room_name}")
+    logger.info("User %s joined project room: %s", user_id, room_name)
 
 @socketio.on('leave_project')
 def handle_leave_project(data):
@@ -94,25 +154,23 @@ def handle_leave_project(data):
     Args:
         data: Dictionary containing project_id
     """
-    if request.sid not in connected_users:
+    user_id = connected_users.get(request.sid)
+    if user_id is None:
         return
     
     project_id = data.get('project_id')
     if not project_id:
         return
     
-    room_name = f"project_{project_id}"
+    room_name = room_name_for('project', project_id)
     leave_room(room_name)
     
-    user_data = connected_users[request.sid]
-    user_id = user_data['user_id']
-    
     emit('left_project', {
         'project_id': project_id,
         'room': room_name
     })
     
-    logger.info(f"User {user_id} left project room: {room_name}")
+    logger.info("User %s left project room: %s", user_id, room_name)
 
 @socketio.on('task_status_update')
 def handle_task_status_update(data):
@@ -122,33 +180,29 @@ def handle_task_status_update(data):
     Args:
         data: Dictionary containing task_id, status, project_id
     """
-    if request.sid not in connected_users:
+    user_id = connected_users.get(request.sid)
+    if user_id is None:
         emit('error', {'message': 'Not authenticated'})
         return
     
-    task_id = data.get('task_id')
-    status = data.get('status')
-    project_id = data.get('project_id')
-    
-    if not all([task_id, status, project_id]):
+    fields = _event_fields(data, ('task_id', 'status', 'project_id'), ('timestamp',))
+    if fields is None:
         emit('error', {'message': 'Missing required fields'})
         return
-    
-    user_data = connected_users[request.sid]
-    user_id = user_data['user_id']
+    task_id, status, project_id, timestamp = fields
     
     # Broadcast to project room
     update_data = {
         'task_id': task_id,
         'status': status,
         'updated_by': user_id,
-        'timestamp': data.get('timestamp'),
+        'timestamp': timestamp,
         'project_id': project_id
     }
     
-    socketio.emit('task_updated', update_data, room=f"project_{project_id}")
+    socketio.emit('task_updated', update_data, room=room_name_for('project', project_id))
     
-    logger.info(f"Task {task_id} status updated to {status} by user {user_id}")
+    logger.debug("Task %s status updated to %s by user %s", task_id, status, user_id)
 
 @socketio.on('task_assignment_update')
 def handle_task_assignment(data):
@@ -158,37 +212,33 @@ def handle_task_assignment(data):
     Args:
         data: Dictionary containing task_id, assignee_id, project_id
     """
-    if request.sid not in connected_users:
+    user_id = connected_users.get(request.sid)
+    if user_id is None:
         emit('error', {'message': 'Not authenticated'})
         return
     
-    task_id = data.get('task_id')
-    assignee_id = data.get('assignee_id')
-    project_id = data.get('project_id')
-    
-    if not all([task_id, project_id]):
+    fields = _event_fields(data, ('task_id', 'project_id'), ('assignee_id', 'timestamp'))
+    if fields is None:
         emit('error', {'message': 'Missing required fields'})
         return
-    
-    user_data = connected_users[request.sid]
-    user_id = user_data['user_id']
+    task_id, project_id, assignee_id, timestamp = fields
     
     # Broadcast to project room
     assignment_data = {
         'task_id': task_id,
         'assignee_id': assignee_id,
         'assigned_by': user_id,
-        'timestamp': data.get('timestamp'),
+        'timestamp': timestamp,
         'project_id': project_id
     }
     
-    socketio.emit('task_assigned', assignment_data, room=f"project_{project_id}")
+    socketio.emit('task_assigned', assignment_data, room=room_name_for('project', project_id))
     
     # Also notify the assigned user directly
     if assignee_id:
-        socketio.emit('task_assigned_to_you', assignment_data, room=f"user_{assignee_id}")
+        socketio.emit('task_assigned_to_you', assignment_data, room=room_name_for('user', assignee_id))
     
-    logger.info(f"Task {task_id} assigned to user {assignee_id} by user {user_id}")
+    logger.debug("Task %s assigned to user %s by user %s", task_id, assignee_id, user_id)
 
 @socketio.on('new_comment')
 def handle_new_comment(data):
@@ -198,33 +248,29 @@ def handle_new_comment(data):
     Args:
         data: Dictionary containing task_id, comment, project_id
     """
-    if request.sid not in connected_users:
+    user_id = connected_users.get(request.sid)
+    if user_id is None:
         emit('error', {'message': 'Not authenticated'})
         return
     
-    task_id = data.get('task_id')
-    comment = data.get('comment')
-    project_id = data.get('project_id')
-    
-    if not all([task_id, comment, project_id]):
+    fields = _event_fields(data, ('task_id', 'comment', 'project_id'), ('timestamp',))
+    if fields is None:
         emit('error', {'message': 'Missing required fields'})
         return
-    
-    user_data = connected_users[request.sid]
-    user_id = user_data['user_id']
+    task_id, comment, project_id, timestamp = fields
     
     # Broadcast to project room
     comment_data = {
         'task_id': task_id,
         'comment': comment,
         'author_id': user_id,
-        'timestamp': data.get('timestamp'),
+        'timestamp': timestamp,
         'project_id': project_id
     }
     
-    socketio.emit('comment_added', comment_data, room=f"project_{project_id}")
+    socketio.emit('comment_added', comment_data, room=room_name_for('project', project_id))
     
-    logger.info(f"New comment added to task {task_id} by user {user_id}")
+    logger.debug("New comment added to task %s by user %s", task_id, user_id)
 
 @socketio.on('user_typing')
 def handle_user_typing(data):
@@ -234,20 +280,46 @@ def handle_user_typing(data):
     Args:
         data: Dictionary containing task_id, project_id, is_typing
     """
-    if request.sid not in connected_users:
+    user_id = connected_users.get(request.sid)
+    if user_id is None:
         return
     
-    task_id = data.get('task_id')
-    project_id = data.get('project_id')
-    is_typing = data.get('is_typing', False)
-    
-    if not all([task_id, project_id]):
+    fields = _event_fields(data, ('task_id', 'project_id'), ('is_typing',))
+    if fields is None:
+        return
+    task_id, project_id, is_typing = fields
+    is_typing = bool(is_typing)
+    
+    # Clients send this on every keystroke; only changes and a periodic
+    # refresh are broadcast
+    sid = request.sid
+    key = (sid, task_id)
+    now = time.monotonic()
+    with _typing_lock:
+        state = _typing_state.get(key)
+        was_typing = state is not None and state[0]
+        if is_typing:
+            if state is None:
+                state = _typing_state[key] = [False, 0.0, now]
+            state[2] = now
+        elif state is None:
+            return
+        broadcast = is_typing != was_typing or now - state[1] >= TYPING_REFRESH_INTERVAL
+        if broadcast:
+            state[0] = is_typing
+            state[1] = now
+    
+    if not broadcast:
         return
     
-    user_data = connected_users[request.sid]
-    user_id = user_data['user_id']
+    _emit_typing_status(sid, task_id, project_id, user_id, is_typing)
     
-    # Broadcast typing status to project room (excluding sender)
+    # Clear the indicator if the keystrokes stop without an explicit stop
+    if is_typing and not was_typing:
+        socketio.start_background_task(_expire_typing, sid, task_id, project_id, user_id)
+
+def _emit_typing_status(sid, task_id, project_id, user_id, is_typing):
+    """Broadcast typing status to the project room, excluding the typist"""
     typing_data = {
         'task_id': task_id,
         'user_id': user_id,
@@ -255,11 +327,22 @@ def handle_user_typing(data):
         'project_id': project_id
     }
     
-    socketio.emit('user_typing_status', typing_data, room=f"project_{project_id}", include_self=False)
+    socketio.emit('user_typing_status', typing_data, room=room_name_for('project', project_id), skip_sid=sid)
 
-@socketio.on('ping')
-def handle_ping():
-    """
-    Handle ping/pong for connection keepalive
-    """
-    emit('pong', {'timestamp': data.get('timestamp') if 'data' in locals() else None})
\ No newline at end of file
+def _expire_typing(sid, task_id, project_id, user_id):
+    """Background task broadcasting a stop once a typist goes idle"""
+    key = (sid, task_id)
+    while True:
+        socketio.sleep(TYPING_IDLE_TIMEOUT)
+        with _typing_lock:
+            state = _typing_state.get(key)
+            if state is not None:
+                if not state[0]:
+                    # Stopped explicitly, already broadcast
+                    return
+                if time.monotonic() - state[2] < TYPING_IDLE_TIMEOUT:
+                    continue
+                state[0] = False
+        
+        _emit_typing_status(sid, task_id, project_id, user_id, False)
+        return
\ No newline at end of file
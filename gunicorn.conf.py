@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration for the Task Manager application
+
+Request handling is dominated by PostgreSQL round-trips, so each worker runs
+gevent and multiplexes many in-flight requests instead of blocking on one.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+
+worker_class = 'gevent'
+worker_connections = 1000
+# Set WEB_CONCURRENCY per instance size; in a container cpu_count() reports
+# the host's CPUs rather than the quota, so the fallback is capped
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+
+def post_fork(server, worker):
+    """
+    Make psycopg2 cooperative in each worker
+
+    The gevent worker monkey-patches the stdlib before loading the app, but
+    psycopg2 is a C extension and would still block the whole worker while
+    waiting on the database without this wait callback.
+    """
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
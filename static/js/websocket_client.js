@@ -52,6 +52,12 @@ class TaskManagerWebSocket {
             transports: ['websocket', 'polling']
         };
         
+        // Must match the server's WEBSOCKET_SERIALIZER, e.g. the
+        // socket.io-msgpack-parser module when it is 'msgpack'
+        if (this.config.parser) {
+            socketOptions.parser = this.config.parser;
+        }
+        
         this.socket = io(this.config.url, socketOptions);
         this.setupEventListeners();
     }
@@ -141,16 +147,21 @@ class TaskManagerWebSocket {
             this.showNotification('Due Date Reminder', `Task "${data.task.title}" is due soon`, 'warning');
         });
         
+        // Task and comment events arrive coalesced per project; replay each
+        // through the listener registered for its type, stamped with the
+        // batch's timestamp
+        this.socket.on('batch', (data) => {
+            data.events.forEach((event) => {
+                const stamped = { timestamp: data.timestamp, ...event };
+                this.socket.listeners(event.type).forEach((listener) => listener(stamped));
+            });
+        });
+        
         // Error handling
         this.socket.on('error', (error) => {
             console.error('WebSocket error:', error);
             this.showNotification('Connection Error', error.message, 'error');
         });
-        
-        // Pong response
-        this.socket.on('pong', (data) => {
-            this.log('Pong received:', data);
-        });
     }
     
     /**
@@ -230,15 +241,6 @@ class TaskManagerWebSocket {
         this.socket.emit('user_typing', data);
     }
     
-    /**
-     * Send ping to server
-     */
-    ping() {
-        if (this.isConnected) {
-            this.socket.emit('ping', { timestamp: new Date().toISOString() });
-        }
-    }
-    
     /**
      * Register event handler
      */